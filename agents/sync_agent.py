@@ -16,15 +16,20 @@ class SyncAgent:
     Agent that syncs results back to ticket systems
     """
     
-    def __init__(self, custom_credentials: Optional[Dict] = None):
+    def __init__(
+        self,
+        custom_credentials: Optional[Dict] = None,
+        integration_manager: Optional[IntegrationManager] = None
+    ):
         """
         Initialize Sync Agent
         
         Args:
             custom_credentials: Optional custom credentials for integrations
+            integration_manager: Optional existing manager to reuse (keeps its connected clients)
         """
         self.name = "SyncAgent"
-        self.integration_manager = IntegrationManager(custom_credentials=custom_credentials)
+        self.integration_manager = integration_manager or IntegrationManager(custom_credentials=custom_credentials)
     
     def process(self, state: AgentState, sync_options: Optional[Dict] = None) -> tuple[AgentState, Dict]:
         """
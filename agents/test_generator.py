@@ -2,13 +2,13 @@
 Test Case Generator Agent
 Generates detailed, structured test cases from the QA roadmap
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
 import google.generativeai as genai
 from agents.state import AgentState, TestCase, log_agent_action
 from utils.rate_limiter import RateLimiter
 from utils.api_cache import APICache
-from utils.api_helper import call_gemini_with_retry
+from utils.api_helper import call_gemini_batch
 import os
 
 
@@ -29,9 +29,14 @@ class TestGeneratorAgent:
         """
         state["current_agent"] = self.name
         
-        # Generate test cases for each category
-        for category, scenarios in state["qa_roadmap"].items():
-            test_cases = self._generate_test_cases_for_category(state, category, scenarios)
+        # Generate test cases for each category. The categories' LLM calls are
+        # independent, so they are made together; results are then added in
+        # roadmap order so test IDs are numbered exactly as before.
+        categories = list(state["qa_roadmap"].items())
+        results = self._generate_results(state, categories)
+        
+        for (category, _), result in zip(categories, results):
+            test_cases = self._to_test_cases(state, category, result)
             state["test_cases"].extend(test_cases)
         
         # Log action
@@ -42,85 +47,94 @@ class TestGeneratorAgent:
         
         return state
     
-    def _generate_test_cases_for_category(
+    def _generate_results(
         self, 
         state: AgentState, 
-        category: str, 
-        scenarios: List[str]
-    ) -> List[TestCase]:
-        """Generate test cases for a specific category"""
-        
-        # Build prompt
-        prompt = self._build_generation_prompt(state, category, scenarios)
+        categories: List[Tuple[str, List[str]]]
+    ) -> List[Dict]:
+        """Get the generated test case JSON for each (category, scenarios) pair"""
         model_name = os.getenv("LLM_MODEL", "gemini-2.0-flash-exp")
         
-        # Check cache first
         config = {
             "temperature": float(os.getenv("LLM_TEMPERATURE", "0.3")),
             "response_mime_type": "application/json"
         }
         
-        full_prompt = f"{self._get_system_prompt()}\n\n{prompt}"
-        cached_response = None
+        system_prompt = self._get_system_prompt()
+        full_prompts = [
+            f"{system_prompt}\n\n{self._build_generation_prompt(state, category, scenarios)}"
+            for category, scenarios in categories
+        ]
         
+        # Check cache first
+        results: List[Optional[Dict]] = [None] * len(full_prompts)
         if self.api_cache:
-            cached_response = self.api_cache.get(full_prompt, model_name, config)
-        
-        if cached_response:
-            try:
-                result = json.loads(cached_response)
-            except json.JSONDecodeError:
-                # If cached response is invalid, regenerate
-                cached_response = None
-                result = None
+            for i, full_prompt in enumerate(full_prompts):
+                cached_response = self.api_cache.get(full_prompt, model_name, config)
+                if cached_response:
+                    try:
+                        results[i] = json.loads(cached_response)
+                    except json.JSONDecodeError:
+                        # If cached response is invalid, regenerate
+                        pass
         
-        if not cached_response:
-            # Wait for rate limit if needed
-            if self.rate_limiter:
-                self.rate_limiter.wait_if_needed()
-            
-            # Call Gemini with retry logic
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            # Call Gemini with retry logic; each call waits for the rate limit
             model = self.llm.GenerativeModel(model_name=model_name)
-            response_text = call_gemini_with_retry(
+            
+            def cache_response(batch_index: int, response_text: str):
+                # Cache each response as soon as it arrives, so a later
+                # category failing doesn't throw away the ones that succeeded
+                if self.api_cache:
+                    prompt = full_prompts[missing[batch_index]]
+                    self.api_cache.set(prompt, model_name, config, response_text)
+            
+            response_texts = call_gemini_batch(
                 model,
-                full_prompt,
+                [full_prompts[i] for i in missing],
                 config,
-                max_retries=3
+                rate_limiter=self.rate_limiter,
+                max_retries=3,
+                on_result=cache_response
             )
             
-            # Cache the response
-            if self.api_cache:
-                self.api_cache.set(full_prompt, model_name, config, response_text)
-            
-            # Parse JSON with error handling
-            try:
-                # Clean up response text
-                cleaned_text = response_text.strip()
-                
-                # Remove markdown code blocks if present
-                if cleaned_text.startswith("```json"):
-                    cleaned_text = cleaned_text[7:]
-                if cleaned_text.startswith("```"):
-                    cleaned_text = cleaned_text[3:]
-                if cleaned_text.endswith("```"):
-                    cleaned_text = cleaned_text[:-3]
-                
-                cleaned_text = cleaned_text.strip()
-                
-                # Try to find JSON object in the text
-                if '{' in cleaned_text and '}' in cleaned_text:
-                    start = cleaned_text.index('{')
-                    end = cleaned_text.rindex('}') + 1
-                    cleaned_text = cleaned_text[start:end]
-                
-                result = json.loads(cleaned_text)
-            except json.JSONDecodeError as e:
-                # Fallback: return empty test cases
-                print(f"JSON parsing error in test_generator: {e}")
-                print(f"Response text: {response_text[:500]}...")
-                result = {"test_cases": []}
+            for i, response_text in zip(missing, response_texts):
+                results[i] = self._parse_response(response_text)
         
-        # Convert to TestCase format
+        return results
+    
+    def _parse_response(self, response_text: str) -> Dict:
+        """Parse JSON with error handling"""
+        try:
+            # Clean up response text
+            cleaned_text = response_text.strip()
+            
+            # Remove markdown code blocks if present
+            if cleaned_text.startswith("```json"):
+                cleaned_text = cleaned_text[7:]
+            if cleaned_text.startswith("```"):
+                cleaned_text = cleaned_text[3:]
+            if cleaned_text.endswith("```"):
+                cleaned_text = cleaned_text[:-3]
+            
+            cleaned_text = cleaned_text.strip()
+            
+            # Try to find JSON object in the text
+            if '{' in cleaned_text and '}' in cleaned_text:
+                start = cleaned_text.index('{')
+                end = cleaned_text.rindex('}') + 1
+                cleaned_text = cleaned_text[start:end]
+            
+            return json.loads(cleaned_text)
+        except json.JSONDecodeError as e:
+            # Fallback: return empty test cases
+            print(f"JSON parsing error in test_generator: {e}")
+            print(f"Response text: {response_text[:500]}...")
+            return {"test_cases": []}
+    
+    def _to_test_cases(self, state: AgentState, category: str, result: Dict) -> List[TestCase]:
+        """Convert to TestCase format"""
         test_cases = []
         for idx, tc in enumerate(result.get("test_cases", [])):
             test_case = TestCase(
@@ -2,18 +2,24 @@
 Ticket-to-Test AI - Streamlit Demo Application
 """
 import streamlit as st
+import io
 import os
+import hashlib
+import functools
 from dotenv import load_dotenv
 import time
+from datetime import datetime
 from pathlib import Path
 import json
+import re
 import google.generativeai as genai
 
 from agents.orchestrator import AgentOrchestrator
 from agents.state import TicketInfo
 from utils.excel_exporter import ExcelExporter
-from utils.sample_tickets import get_sample_ticket, SAMPLE_TICKETS
-from database.db_manager import DatabaseManager
+from utils.sample_tickets import get_sample_ticket
+from database.db_manager import get_db_manager
+from integrations.manager import IntegrationManager
 
 # Load environment variables
 load_dotenv()
@@ -27,6 +33,75 @@ def get_current_model():
     """Get current model name (custom overrides .env)"""
     return st.session_state.get('custom_model') or os.getenv("LLM_MODEL", "gemini-2.0-flash-exp")
 
+def get_custom_credentials():
+    """Build integration credentials from the sidebar config in session state"""
+    custom_creds = {}
+    if st.session_state.get('jira_url') and st.session_state.get('jira_token'):
+        custom_creds['jira'] = {
+            'url': st.session_state.get('jira_url'),
+            'email': st.session_state.get('jira_email'),
+            'token': st.session_state.get('jira_token')
+        }
+    if st.session_state.get('ado_org') and st.session_state.get('ado_pat'):
+        custom_creds['azure_devops'] = {
+            'org': st.session_state.get('ado_org'),
+            'pat': st.session_state.get('ado_pat'),
+            'project': st.session_state.get('ado_project')
+        }
+    return custom_creds
+
+def credentials_cache_key(custom_creds):
+    """Convert a credentials dict into a hashable key for get_integration_manager"""
+    return tuple(sorted(
+        (name, tuple(sorted(values.items())))
+        for name, values in custom_creds.items()
+    ))
+
+def excel_state_fingerprint(state):
+    """Short hash of the exported results, used to tell whether a saved Excel file is stale"""
+    payload = json.dumps(
+        [state.get(key) for key in ('ticket_info', 'test_cases', 'qa_roadmap', 'coverage_gaps', 'clarification_questions')],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+def set_final_state(state):
+    """Store the current results along with their fingerprint, so reruns don't re-hash them"""
+    st.session_state.final_state = state
+    st.session_state.final_state_hash = excel_state_fingerprint(state) if state else None
+
+def final_state_fingerprint(state):
+    """excel_state_fingerprint(state), reusing the one stored by set_final_state when it applies"""
+    if state is st.session_state.get('final_state') and st.session_state.get('final_state_hash'):
+        return st.session_state.final_state_hash
+    return excel_state_fingerprint(state)
+
+@functools.lru_cache(maxsize=256)
+def format_generation_date(generation_date):
+    """Format a stored ISO timestamp for display (memoized, since main() reruns on every interaction)"""
+    if not generation_date:
+        return 'N/A'
+    try:
+        return datetime.fromisoformat(generation_date).strftime("%b %d, %Y %I:%M %p")
+    except ValueError:
+        return generation_date[:16]
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def read_excel_bytes(excel_path, mtime_ns):
+    """Read an exported Excel file; mtime_ns is part of the cache key so edits invalidate it"""
+    return Path(excel_path).read_bytes()
+
+@st.cache_resource(max_entries=16, ttl=3600, show_spinner=False)
+def get_integration_manager(creds_key):
+    """
+    Shared IntegrationManager per credential set, so connected clients survive reruns
+    
+    Bounded and expiring, since every distinct (or rotated) credential set would
+    otherwise keep its manager and connected clients alive for the process lifetime
+    """
+    return IntegrationManager(custom_credentials={name: dict(values) for name, values in creds_key})
+
 # Page configuration
 st.set_page_config(
     page_title="Ticket-to-Test AI",
@@ -674,7 +749,7 @@ def display_sidebar():
         st.markdown("**📚 Generation History**")
         
         try:
-            db = DatabaseManager()
+            db = get_db_manager()
             
             # Quick stats
             stats = db.get_statistics()
@@ -738,11 +813,12 @@ def display_sidebar():
                                 'processing_time': 0.0
                             }
                             
-                            st.session_state.final_state = loaded_state
+                            set_final_state(loaded_state)
                             st.session_state.current_generation_id = gen_info['id']
                             st.session_state.loaded_from_history = True  # Skip steps 1 & 2
                             if gen_info['excel_file_path']:
                                 st.session_state.excel_path = gen_info['excel_file_path']
+                                st.session_state.excel_state_hash = st.session_state.final_state_hash
                             
                             st.success(f"✅ Loaded: {gen_info['ticket_id']}")
                             st.rerun()
@@ -799,11 +875,12 @@ def display_sidebar():
                                         'processing_time': 0.0
                                     }
                                     
-                                    st.session_state.final_state = loaded_state
+                                    set_final_state(loaded_state)
                                     st.session_state.current_generation_id = gen_info['id']
                                     st.session_state.loaded_from_history = True  # Skip steps 1 & 2
                                     if gen_info['excel_file_path']:
                                         st.session_state.excel_path = gen_info['excel_file_path']
+                                        st.session_state.excel_state_hash = st.session_state.final_state_hash
                                     
                                     st.rerun()
                         with col3:
@@ -1157,24 +1234,7 @@ def display_sample_tickets():
 def display_live_integration():
     """Display live integration input"""
     
-    from integrations.manager import IntegrationManager
-    
-    # Build custom credentials from session state
-    custom_creds = {}
-    if st.session_state.get('jira_url') and st.session_state.get('jira_token'):
-        custom_creds['jira'] = {
-            'url': st.session_state.get('jira_url'),
-            'email': st.session_state.get('jira_email'),
-            'token': st.session_state.get('jira_token')
-        }
-    if st.session_state.get('ado_org') and st.session_state.get('ado_pat'):
-        custom_creds['azure_devops'] = {
-            'org': st.session_state.get('ado_org'),
-            'pat': st.session_state.get('ado_pat'),
-            'project': st.session_state.get('ado_project')
-        }
-    
-    manager = IntegrationManager(custom_credentials=custom_creds)
+    manager = get_integration_manager(credentials_cache_key(get_custom_credentials()))
     
     # Integration selection
     col1, col2 = st.columns(2)
@@ -1572,7 +1632,7 @@ def process_ticket(ticket: TicketInfo):
                     progress_callback=progress_callback
                 )
             
-            st.session_state.final_state = final_state
+            set_final_state(final_state)
             st.session_state.processing = False
             st.session_state.refinement_history = []  # Clear refinement history for new generation
             
@@ -1584,7 +1644,7 @@ def process_ticket(ticket: TicketInfo):
             
             # Auto-save to database
             try:
-                db = DatabaseManager()
+                db = get_db_manager()
                 generation_id = db.save_generation(final_state)
                 st.session_state.current_generation_id = generation_id
                 st.info(f"💾 Results saved to history (ID: {generation_id[:8]}...)")
@@ -1780,63 +1840,67 @@ def display_results(state):
                     filename = f"TestCases_{ticket_id}_{time.strftime('%Y%m%d_%H%M%S')}.xlsx"
                     output_path = output_dir / filename
                     
-                    # Export
+                    # Export to memory once; the same bytes go to disk and to the download
+                    buffer = io.BytesIO()
                     exporter = ExcelExporter()
-                    exporter.export_test_cases(state, str(output_path))
+                    exporter.export_test_cases(state, buffer)
+                    excel_bytes = buffer.getvalue()
+                    output_path.write_bytes(excel_bytes)
                     
                     # Store path in session for sync
                     st.session_state.excel_path = str(output_path)
+                    st.session_state.excel_state_hash = final_state_fingerprint(state)
                     
                     # Update database with Excel file path
                     if hasattr(st.session_state, 'current_generation_id'):
                         try:
-                            db = DatabaseManager()
+                            db = get_db_manager()
                             # Update existing generation with Excel path
                             db.update_excel_path(st.session_state.current_generation_id, str(output_path))
                         except:
                             pass  # Silent fail if DB update fails
                     
                     # Download button
-                    with open(output_path, 'rb') as f:
+                    st.download_button(
+                        label="⬇️ Download Excel File",
+                        data=excel_bytes,
+                        file_name=filename,
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        use_container_width=True
+                    )
+                    
+                    st.success(f"✅ Excel file generated: {filename}")
+            else:
+                # Keep offering the last export across reruns while it still
+                # matches these results; one stat() decides, bytes come from cache
+                excel_path = st.session_state.get('excel_path')
+                if excel_path and st.session_state.get('excel_state_hash') == final_state_fingerprint(state):
+                    try:
+                        excel_mtime_ns = Path(excel_path).stat().st_mtime_ns
+                    except OSError:
+                        excel_mtime_ns = None
+                    
+                    if excel_mtime_ns is not None:
                         st.download_button(
                             label="⬇️ Download Excel File",
-                            data=f,
-                            file_name=filename,
+                            data=read_excel_bytes(excel_path, excel_mtime_ns),
+                            file_name=Path(excel_path).name,
                             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                             use_container_width=True
                         )
-                    
-                    st.success(f"✅ Excel file generated: {filename}")
         
         # Only show sync for tickets from live integrations (not sample or custom)
         if st.session_state.get('ticket_source') == 'live':
             with col2:
                 st.markdown("### 🔄 Sync to Jira/Azure DevOps")
                 
-                from integrations.manager import IntegrationManager
+                custom_creds = get_custom_credentials()
+                manager = get_integration_manager(credentials_cache_key(custom_creds))
                 
-                # Build custom credentials from session state
-                custom_creds = {}
-                if st.session_state.get('jira_url') and st.session_state.get('jira_token'):
-                    custom_creds['jira'] = {
-                        'url': st.session_state.get('jira_url'),
-                        'email': st.session_state.get('jira_email'),
-                        'token': st.session_state.get('jira_token')
-                    }
-                if st.session_state.get('ado_org') and st.session_state.get('ado_pat'):
-                    custom_creds['azure_devops'] = {
-                        'org': st.session_state.get('ado_org'),
-                        'pat': st.session_state.get('ado_pat'),
-                        'project': st.session_state.get('ado_project')
-                    }
-                
-                manager = IntegrationManager(custom_credentials=custom_creds)
-                
-                # Check if any integration is configured
-                jira_configured = manager.is_configured('jira')
-                ado_configured = manager.is_configured('azure_devops')
-                
-                if not (jira_configured or ado_configured):
+                # Check if any integration is configured. is_configured() only
+                # inspects credentials (no network call), so short-circuit rather
+                # than evaluating both
+                if not (manager.is_configured('jira') or manager.is_configured('azure_devops')):
                     st.info("⚠️ Configure Jira or Azure DevOps in the sidebar to sync results back")
                 else:
                     sync_options = []
@@ -1852,9 +1916,16 @@ def display_results(state):
                             try:
                                 from agents.sync_agent import SyncAgent
                                 
-                                # Ensure Excel is generated if attaching
+                                # Ensure Excel is generated if attaching. Reuse the last export
+                                # unless the file is gone or the results changed since
                                 excel_path = st.session_state.get('excel_path')
-                                if attach_file and not excel_path:
+                                state_hash = final_state_fingerprint(state)
+                                excel_is_current = (
+                                    excel_path
+                                    and Path(excel_path).is_file()
+                                    and st.session_state.get('excel_state_hash') == state_hash
+                                )
+                                if attach_file and not excel_is_current:
                                     # Generate Excel first
                                     output_dir = Path("outputs")
                                     output_dir.mkdir(exist_ok=True)
@@ -1863,9 +1934,11 @@ def display_results(state):
                                     excel_path = str(output_dir / filename)
                                     exporter = ExcelExporter()
                                     exporter.export_test_cases(state, excel_path)
+                                    st.session_state.excel_path = excel_path
+                                    st.session_state.excel_state_hash = state_hash
                                 
-                                # Pass custom credentials to SyncAgent
-                                sync_agent = SyncAgent(custom_credentials=custom_creds)
+                                # Reuse the cached manager so SyncAgent doesn't reconnect
+                                sync_agent = SyncAgent(integration_manager=manager)
                                 sync_options = {
                                     'post_comment': post_comment,
                                     'attach_file': attach_file,
@@ -2036,9 +2109,6 @@ Ensure the refined test cases:
                             response_text = response.text.strip()
                             
                             # Extract JSON from response
-                            import json
-                            import re
-                            
                             # Try to extract JSON from markdown code blocks
                             json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
                             if json_match:
@@ -2050,6 +2120,7 @@ Ensure the refined test cases:
                             if 'test_cases' in refined_data:
                                 st.session_state.final_state['test_cases'] = refined_data['test_cases']
                                 st.session_state.final_state['total_test_cases'] = len(refined_data['test_cases'])
+                                set_final_state(st.session_state.final_state)  # Refresh its fingerprint
                                 
                                 # Track refinement in history
                                 changes_summary = refined_data.get('changes_summary', 'Test cases updated')
@@ -2057,7 +2128,7 @@ Ensure the refined test cases:
                                 
                                 # Save refined version to database
                                 try:
-                                    db = DatabaseManager()
+                                    db = get_db_manager()
                                     generation_id = db.save_generation(st.session_state.final_state)
                                     st.session_state.current_generation_id = generation_id
                                 except:
@@ -2101,7 +2172,6 @@ Ensure the refined test cases:
                         result_text = parts[1]
                         
                         # Split on numbered points like "1)", "2)", etc.
-                        import re
                         sentences = re.split(r'(\d+\))', result_text)
                         
                         formatted_result = ""
@@ -2134,7 +2204,7 @@ def main():
     # Cleanup orphaned database records on startup (run once per session)
     if 'db_cleaned' not in st.session_state:
         try:
-            db = DatabaseManager()
+            db = get_db_manager()
             orphaned_count = db.cleanup_orphaned_records()
             if orphaned_count > 0:
                 st.toast(f"🧹 Cleaned up {orphaned_count} orphaned database records", icon="✅")
@@ -2153,7 +2223,7 @@ def main():
         # Start New Generation button at the very top
         if st.button("🆕 Start New Generation", type="secondary", key="start_new_gen"):
             st.session_state.loaded_from_history = False
-            st.session_state.final_state = None
+            set_final_state(None)
             st.session_state.selected_ticket = None
             st.session_state.ticket_input_mode = None
             st.session_state.refinement_history = []
@@ -2177,10 +2247,8 @@ def main():
         generation_date = None
         if generation_id:
             try:
-                db = DatabaseManager()
-                gen_data = db.get_generation_by_id(generation_id)
-                if gen_data:
-                    generation_date = gen_data['generation'].get('timestamp')
+                db = get_db_manager()
+                generation_date = db.get_generation_timestamp(generation_id)
             except:
                 pass
         
@@ -2200,16 +2268,7 @@ def main():
             st.info(f"{len(st.session_state.final_state.get('test_cases', []))}")
         with col4:
             st.markdown("**Generated On**")
-            if generation_date:
-                from datetime import datetime
-                try:
-                    dt = datetime.fromisoformat(generation_date)
-                    formatted_date = dt.strftime("%b %d, %Y %I:%M %p")
-                    st.info(formatted_date)
-                except:
-                    st.info(generation_date[:16] if generation_date else 'N/A')
-            else:
-                st.info('N/A')
+            st.info(format_generation_date(generation_date))
         
         # Display Generation ID if available
         if generation_id:
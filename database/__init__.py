@@ -1,6 +1,6 @@
 """
 Database package for persistent storage
 """
-from database.db_manager import DatabaseManager
+from database.db_manager import DatabaseManager, get_db_manager
 
-__all__ = ['DatabaseManager']
+__all__ = ['DatabaseManager', 'get_db_manager']
@@ -4,8 +4,11 @@ Handles all database operations for persistent storage
 """
 import sqlite3
 import os
-import json
+import copy
 import uuid
+import threading
+from collections import defaultdict
+from functools import lru_cache
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 from pathlib import Path
@@ -13,13 +16,47 @@ import logging
 
 from database.models import Generation, TestCase, CoverageGap
 
+# orjson is much faster for the per-test-case test_steps blobs; fall back to
+# the stdlib if it isn't installed
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+    
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
 
 logger = logging.getLogger(__name__)
 
+# Columns returned by the history list queries (get_all_generations, search_generations)
+_GENERATION_LIST_COLUMNS = (
+    'id', 'ticket_id', 'ticket_title', 'ticket_type',
+    'timestamp', 'total_test_cases', 'excel_file_path', 'status'
+)
+_GENERATION_LIST_SELECT = ", ".join(_GENERATION_LIST_COLUMNS)
+
+
+@lru_cache(maxsize=1)
+def _load_schema() -> str:
+    """Read schema.sql once per process"""
+    schema_path = Path(__file__).parent / "schema.sql"
+    with open(schema_path, 'r') as f:
+        return f.read()
+
 
 class DatabaseManager:
     """Manages database operations for test generation history"""
     
+    # Database files whose schema has already been applied in this process
+    _initialized_paths = set()
+    _initialized_lock = threading.Lock()
+    
     def __init__(self, db_path: str = "ticket_test.db"):
         """
         Initialize database manager
@@ -28,27 +65,73 @@ class DatabaseManager:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
-        self._init_database()
+        is_new_file = not os.path.exists(db_path)
+        # Single long-lived connection shared by all methods; the lock
+        # serializes access since Streamlit may call in from several threads
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        # Bumped by every write through this instance; invalidates _statistics_cache
+        self._write_version = 0
+        self._statistics_cache = None
+        self._init_database(force_schema=is_new_file)
+        self._read_conn, self._read_lock = self._open_read_connection()
     
-    def _init_database(self):
-        """Initialize database and create tables if they don't exist"""
+    def _init_database(self, force_schema: bool = False):
+        """
+        Initialize database and create tables if they don't exist
+        
+        Args:
+            force_schema: Apply the schema even if this path was set up before
+        """
         try:
-            # Read schema file
-            schema_path = Path(__file__).parent / "schema.sql"
-            with open(schema_path, 'r') as f:
-                schema_sql = f.read()
-            
-            # Execute schema
-            conn = sqlite3.connect(self.db_path)
-            conn.executescript(schema_sql)
-            conn.commit()
-            conn.close()
-            
+            db_key = os.path.abspath(self.db_path)
+            
+            with self._lock:
+                # Execute schema, unless an earlier instance already set up this file
+                with DatabaseManager._initialized_lock:
+                    if force_schema or db_key not in DatabaseManager._initialized_paths:
+                        self._conn.executescript(_load_schema())
+                        self._conn.commit()
+                        DatabaseManager._initialized_paths.add(db_key)
+
+                # WAL lets the sidebar's reads run alongside a save and, with
+                # synchronous=NORMAL, avoids an fsync on every commit.
+                # journal_mode is stored in the file; the rest are per-connection.
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                # Required for ON DELETE CASCADE in the schema to take effect
+                self._conn.execute("PRAGMA foreign_keys=ON")
+                self._conn.execute("PRAGMA cache_size=-20000")  # ~20 MiB page cache
+
             logger.info(f"Database initialized at {self.db_path}")
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
             raise
     
+    def _open_read_connection(self):
+        """
+        Open a read-only connection for the history/statistics queries
+        
+        With WAL enabled, readers on a separate connection don't wait for
+        a save in progress on the main one.
+        
+        Returns:
+            Tuple of (connection, lock) to use for reads
+        """
+        if self.db_path == ":memory:":
+            # A second in-memory connection would be a different database
+            return self._conn, self._lock
+        
+        try:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            read_conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            read_conn.execute("PRAGMA query_only=1")
+            read_conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+            return read_conn, threading.Lock()
+        except Exception as e:
+            logger.warning(f"Read-only connection unavailable, sharing the main one: {e}")
+            return self._conn, self._lock
+    
     def save_generation(
         self,
         state: Dict[str, Any],
@@ -70,61 +153,60 @@ class DatabaseManager:
             test_cases = state.get('test_cases', [])
             coverage_gaps = state.get('coverage_gaps', [])
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Save generation
-            cursor.execute("""
-                INSERT INTO generations 
-                (id, ticket_id, ticket_title, ticket_type, ticket_description, 
-                 ticket_acceptance_criteria, timestamp, excel_file_path, status, total_test_cases, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                generation_id,
-                ticket_info.get('ticket_id', ''),
-                ticket_info.get('title', ''),
-                ticket_info.get('ticket_type', ''),
-                ticket_info.get('description', ''),
-                json.dumps(ticket_info.get('acceptance_criteria', [])),
-                datetime.now().isoformat(),
-                excel_file_path,
-                'completed',
-                len(test_cases),
-                json.dumps({
-                    'agent_workflow': state.get('agent_workflow', []),
-                    'qa_roadmap': state.get('qa_roadmap', {}),
-                    'clarification_questions': state.get('clarification_questions', []),
-                    'risk_areas': state.get('risk_areas', [])
-                })
-            ))
-            
-            # Save test cases
-            for test_case in test_cases:
+            with self._lock, self._conn:
+                cursor = self._conn.cursor()
+                
+                # Save generation
                 cursor.execute("""
-                    INSERT INTO test_cases
-                    (generation_id, title, priority, category, preconditions,
-                     test_steps, expected_result, test_data)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO generations 
+                    (id, ticket_id, ticket_title, ticket_type, ticket_description, 
+                     ticket_acceptance_criteria, timestamp, excel_file_path, status, total_test_cases, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     generation_id,
-                    test_case.get('title', ''),
-                    test_case.get('priority', 'P2'),
-                    test_case.get('category', ''),
-                    test_case.get('preconditions', ''),
-                    json.dumps(test_case.get('test_steps', [])),
-                    test_case.get('expected_result', ''),
-                    test_case.get('test_data', '')
+                    ticket_info.get('ticket_id', ''),
+                    ticket_info.get('title', ''),
+                    ticket_info.get('ticket_type', ''),
+                    ticket_info.get('description', ''),
+                    _json_dumps(ticket_info.get('acceptance_criteria', [])),
+                    datetime.now().isoformat(),
+                    excel_file_path,
+                    'completed',
+                    len(test_cases),
+                    _json_dumps({
+                        'agent_workflow': state.get('agent_workflow', []),
+                        'qa_roadmap': state.get('qa_roadmap', {}),
+                        'clarification_questions': state.get('clarification_questions', []),
+                        'risk_areas': state.get('risk_areas', [])
+                    })
                 ))
-            
-            # Save coverage gaps
-            for gap in coverage_gaps:
-                cursor.execute("""
-                    INSERT INTO coverage_gaps (generation_id, gap_description)
-                    VALUES (?, ?)
-                """, (generation_id, gap))
-            
-            conn.commit()
-            conn.close()
+                
+                # Save test cases
+                for test_case in test_cases:
+                    cursor.execute("""
+                        INSERT INTO test_cases
+                        (generation_id, title, priority, category, preconditions,
+                         test_steps, expected_result, test_data)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        generation_id,
+                        test_case.get('title', ''),
+                        test_case.get('priority', 'P2'),
+                        test_case.get('category', ''),
+                        test_case.get('preconditions', ''),
+                        _json_dumps(test_case.get('test_steps', [])),
+                        test_case.get('expected_result', ''),
+                        test_case.get('test_data', '')
+                    ))
+                
+                # Save coverage gaps
+                for gap in coverage_gaps:
+                    cursor.execute("""
+                        INSERT INTO coverage_gaps (generation_id, gap_description)
+                        VALUES (?, ?)
+                    """, (generation_id, gap))
+                
+                self._write_version += 1
             
             logger.info(f"Saved generation {generation_id} with {len(test_cases)} test cases")
             return generation_id
@@ -145,17 +227,12 @@ class DatabaseManager:
             True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                UPDATE generations
-                SET excel_file_path = ?
-                WHERE id = ?
-            """, (excel_path, generation_id))
-            
-            conn.commit()
-            conn.close()
+            with self._lock, self._conn:
+                self._conn.execute("""
+                    UPDATE generations
+                    SET excel_file_path = ?
+                    WHERE id = ?
+                """, (excel_path, generation_id))
             
             logger.info(f"Updated Excel path for generation {generation_id}")
             return True
@@ -175,20 +252,17 @@ class DatabaseManager:
             List of generation dictionaries
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT id, ticket_id, ticket_title, ticket_type, 
-                       timestamp, total_test_cases, excel_file_path, status
-                FROM generations
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (limit,))
-            
-            generations = [dict(row) for row in cursor.fetchall()]
-            conn.close()
+            with self._read_lock:
+                cursor = self._read_conn.cursor()
+                
+                cursor.execute(f"""
+                    SELECT {_GENERATION_LIST_SELECT}
+                    FROM generations
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                """, (limit,))
+                
+                generations = [dict(zip(_GENERATION_LIST_COLUMNS, row)) for row in cursor.fetchall()]
             
             return generations
             
@@ -196,85 +270,189 @@ class DatabaseManager:
             logger.error(f"Failed to get generations: {e}")
             return []
     
-    def get_generation_by_id(self, generation_id: str) -> Optional[Dict[str, Any]]:
+    def get_generation_by_id(
+        self,
+        generation_id: str,
+        parse_test_steps: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """
         Get a specific generation with all its test cases and coverage gaps
         
         Args:
             generation_id: UUID of the generation
+            parse_test_steps: Decode each test case's test_steps JSON into a list.
+                Pass False when only counts/summary fields are needed.
         
         Returns:
             Dictionary with generation data, test cases, and coverage gaps
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # Get generation info
-            cursor.execute("""
-                SELECT * FROM generations WHERE id = ?
-            """, (generation_id,))
+            with self._read_lock:
+                cursor = self._read_conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                
+                # Get generation info
+                cursor.execute("""
+                    SELECT * FROM generations WHERE id = ?
+                """, (generation_id,))
+                
+                gen_row = cursor.fetchone()
+                if not gen_row:
+                    return None
+                
+                generation = dict(gen_row)
+                
+                # Get test cases
+                cursor.execute("""
+                    SELECT * FROM test_cases WHERE generation_id = ?
+                """, (generation_id,))
+                test_case_rows = cursor.fetchall()
+                
+                # Get coverage gaps
+                cursor.execute("""
+                    SELECT gap_description FROM coverage_gaps WHERE generation_id = ?
+                """, (generation_id,))
+                
+                coverage_gaps = [row['gap_description'] for row in cursor.fetchall()]
             
-            gen_row = cursor.fetchone()
-            if not gen_row:
-                conn.close()
-                return None
+            return self._build_generation_result(
+                generation, test_case_rows, coverage_gaps, parse_test_steps
+            )
             
-            generation = dict(gen_row)
+        except Exception as e:
+            logger.error(f"Failed to get generation {generation_id}: {e}")
+            return None
+    
+    def get_generations_bulk(
+        self,
+        generation_ids: List[str],
+        parse_test_steps: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several generations with their test cases and coverage gaps at once
+        
+        Uses one query per table instead of calling get_generation_by_id per row.
+        
+        Args:
+            generation_ids: UUIDs of the generations
+            parse_test_steps: Decode each test case's test_steps JSON into a list
+        
+        Returns:
+            Dictionary mapping generation ID to the same structure as
+            get_generation_by_id (IDs that don't exist are omitted)
+        """
+        if not generation_ids:
+            return {}
+        
+        try:
+            placeholders = ",".join("?" * len(generation_ids))
+            
+            with self._read_lock:
+                cursor = self._read_conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                
+                cursor.execute(
+                    f"SELECT * FROM generations WHERE id IN ({placeholders})",
+                    generation_ids
+                )
+                generations = [dict(row) for row in cursor.fetchall()]
+                
+                cursor.execute(
+                    f"SELECT * FROM test_cases WHERE generation_id IN ({placeholders})",
+                    generation_ids
+                )
+                test_cases_by_gen = defaultdict(list)
+                for row in cursor.fetchall():
+                    test_cases_by_gen[row['generation_id']].append(row)
+                
+                cursor.execute(
+                    f"SELECT generation_id, gap_description FROM coverage_gaps WHERE generation_id IN ({placeholders})",
+                    generation_ids
+                )
+                gaps_by_gen = defaultdict(list)
+                for row in cursor.fetchall():
+                    gaps_by_gen[row['generation_id']].append(row['gap_description'])
             
-            # Get test cases
-            cursor.execute("""
-                SELECT * FROM test_cases WHERE generation_id = ?
-            """, (generation_id,))
+            return {
+                generation['id']: self._build_generation_result(
+                    generation,
+                    test_cases_by_gen[generation['id']],
+                    gaps_by_gen[generation['id']],
+                    parse_test_steps
+                )
+                for generation in generations
+            }
             
-            test_cases = []
-            for row in cursor.fetchall():
-                tc = dict(row)
-                # Parse test_steps JSON
+        except Exception as e:
+            logger.error(f"Failed to get generations {generation_ids}: {e}")
+            return {}
+    
+    def _build_generation_result(
+        self,
+        generation: Dict[str, Any],
+        test_case_rows: List[sqlite3.Row],
+        coverage_gaps: List[str],
+        parse_test_steps: bool = True
+    ) -> Dict[str, Any]:
+        """Decode stored JSON columns and assemble a generation result dict"""
+        test_cases = []
+        for row in test_case_rows:
+            tc = dict(row)
+            # Parse test_steps JSON (left as the raw string if not requested)
+            if parse_test_steps:
                 try:
-                    tc['test_steps'] = json.loads(tc['test_steps'])
+                    tc['test_steps'] = _json_loads(tc['test_steps'])
                 except:
                     tc['test_steps'] = []
-                test_cases.append(tc)
-            
-            # Get coverage gaps
-            cursor.execute("""
-                SELECT gap_description FROM coverage_gaps WHERE generation_id = ?
-            """, (generation_id,))
-            
-            coverage_gaps = [row['gap_description'] for row in cursor.fetchall()]
-            
-            # Parse metadata to get qa_roadmap, clarification_questions, and risk_areas
+            test_cases.append(tc)
+        
+        # Parse metadata to get qa_roadmap, clarification_questions, and risk_areas
+        qa_roadmap = {}
+        clarification_questions = []
+        risk_areas = []
+        try:
+            if generation.get('metadata'):
+                metadata = _json_loads(generation['metadata'])
+                qa_roadmap = metadata.get('qa_roadmap', {})
+                clarification_questions = metadata.get('clarification_questions', [])
+                risk_areas = metadata.get('risk_areas', [])
+        except:
             qa_roadmap = {}
             clarification_questions = []
             risk_areas = []
-            try:
-                if generation.get('metadata'):
-                    metadata = json.loads(generation['metadata'])
-                    qa_roadmap = metadata.get('qa_roadmap', {})
-                    clarification_questions = metadata.get('clarification_questions', [])
-                    risk_areas = metadata.get('risk_areas', [])
-            except:
-                qa_roadmap = {}
-                clarification_questions = []
-                risk_areas = []
-            
-            conn.close()
-            
-            return {
-                'generation': generation,
-                'test_cases': test_cases,
-                'coverage_gaps': coverage_gaps,
-                'qa_roadmap': qa_roadmap,
-                'clarification_questions': clarification_questions,
-                'risk_areas': risk_areas
-            }
-            
+        
+        return {
+            'generation': generation,
+            'test_cases': test_cases,
+            'coverage_gaps': coverage_gaps,
+            'qa_roadmap': qa_roadmap,
+            'clarification_questions': clarification_questions,
+            'risk_areas': risk_areas
+        }
+    
+    def get_generation_timestamp(self, generation_id: str) -> Optional[str]:
+        """
+        Get only the timestamp of a generation, without loading its test cases
+
+        Args:
+            generation_id: UUID of the generation
+
+        Returns:
+            ISO timestamp string, or None if not found
+        """
+        try:
+            with self._read_lock:
+                row = self._read_conn.execute(
+                    "SELECT timestamp FROM generations WHERE id = ?",
+                    (generation_id,)
+                ).fetchone()
+
+            return row[0] if row else None
+
         except Exception as e:
-            logger.error(f"Failed to get generation {generation_id}: {e}")
+            logger.error(f"Failed to get timestamp for generation {generation_id}: {e}")
             return None
-    
+
     def delete_generation(self, generation_id: str) -> bool:
         """
         Delete a generation and all its associated data (including Excel file)
@@ -286,30 +464,28 @@ class DatabaseManager:
             True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # First, get the Excel file path before deleting the record
-            cursor.execute(
-                "SELECT excel_file_path FROM generations WHERE id = ?",
-                (generation_id,)
-            )
-            result = cursor.fetchone()
-            excel_file_path = result[0] if result else None
-            
-            # Delete the Excel file from outputs folder if it exists
-            if excel_file_path and os.path.exists(excel_file_path):
-                try:
-                    os.remove(excel_file_path)
-                    logger.info(f"Deleted Excel file: {excel_file_path}")
-                except Exception as file_error:
-                    logger.warning(f"Failed to delete Excel file {excel_file_path}: {file_error}")
-            
-            # Delete generation (CASCADE will delete test_cases and coverage_gaps)
-            cursor.execute("DELETE FROM generations WHERE id = ?", (generation_id,))
-            
-            conn.commit()
-            conn.close()
+            with self._lock, self._conn:
+                cursor = self._conn.cursor()
+                
+                # First, get the Excel file path before deleting the record
+                cursor.execute(
+                    "SELECT excel_file_path FROM generations WHERE id = ?",
+                    (generation_id,)
+                )
+                result = cursor.fetchone()
+                excel_file_path = result[0] if result else None
+                
+                # Delete the Excel file from outputs folder if it exists
+                if excel_file_path and os.path.exists(excel_file_path):
+                    try:
+                        os.remove(excel_file_path)
+                        logger.info(f"Deleted Excel file: {excel_file_path}")
+                    except Exception as file_error:
+                        logger.warning(f"Failed to delete Excel file {excel_file_path}: {file_error}")
+                
+                # Delete generation (CASCADE will delete test_cases and coverage_gaps)
+                cursor.execute("DELETE FROM generations WHERE id = ?", (generation_id,))
+                self._write_version += 1
             
             logger.info(f"Deleted generation {generation_id}")
             return True
@@ -338,13 +514,8 @@ class DatabaseManager:
             List of matching generations
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            query = """
-                SELECT id, ticket_id, ticket_title, ticket_type,
-                       timestamp, total_test_cases, excel_file_path, status
+            query = f"""
+                SELECT {_GENERATION_LIST_SELECT}
                 FROM generations
                 WHERE 1=1
             """
@@ -368,9 +539,10 @@ class DatabaseManager:
             
             query += " ORDER BY timestamp DESC LIMIT 100"
             
-            cursor.execute(query, params)
-            generations = [dict(row) for row in cursor.fetchall()]
-            conn.close()
+            with self._read_lock:
+                cursor = self._read_conn.cursor()
+                cursor.execute(query, params)
+                generations = [dict(zip(_GENERATION_LIST_COLUMNS, row)) for row in cursor.fetchall()]
             
             return generations
             
@@ -386,82 +558,115 @@ class DatabaseManager:
             Dictionary with statistics
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Total generations
-            cursor.execute("SELECT COUNT(*) FROM generations")
-            total_generations = cursor.fetchone()[0]
-            
-            # Total test cases (only from existing generations)
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM test_cases tc
-                INNER JOIN generations g ON tc.generation_id = g.id
-            """)
-            total_test_cases = cursor.fetchone()[0]
-            
-            # Test cases by priority (only from existing generations)
-            cursor.execute("""
-                SELECT tc.priority, COUNT(*) as count
-                FROM test_cases tc
-                INNER JOIN generations g ON tc.generation_id = g.id
-                GROUP BY tc.priority
-            """)
-            by_priority = {row[0]: row[1] for row in cursor.fetchall()}
-            
-            # Test cases by category (only from existing generations)
-            cursor.execute("""
-                SELECT tc.category, COUNT(*) as count
-                FROM test_cases tc
-                INNER JOIN generations g ON tc.generation_id = g.id
-                GROUP BY tc.category
-                ORDER BY count DESC
-                LIMIT 10
-            """)
-            by_category = {row[0]: row[1] for row in cursor.fetchall()}
-            
-            conn.close()
-            
-            return {
-                'total_generations': total_generations,
-                'total_test_cases': total_test_cases,
-                'by_priority': by_priority,
-                'by_category': by_category
-            }
+            with self._read_lock:
+                cursor = self._read_conn.cursor()
+                
+                # data_version changes when another connection commits; our own
+                # writes bump _write_version. Same pair means nothing changed.
+                data_version = cursor.execute("PRAGMA data_version").fetchone()[0]
+                cache_key = (data_version, self._write_version)
+                if self._statistics_cache and self._statistics_cache[0] == cache_key:
+                    return copy.deepcopy(self._statistics_cache[1])
+                
+                # Total generations
+                cursor.execute("SELECT COUNT(*) FROM generations")
+                total_generations = cursor.fetchone()[0]
+                
+                # Test cases by priority and category in a single pass
+                # (only from existing generations)
+                cursor.execute("""
+                    SELECT tc.priority, tc.category, COUNT(*)
+                    FROM test_cases tc
+                    WHERE EXISTS (SELECT 1 FROM generations g WHERE g.id = tc.generation_id)
+                    GROUP BY tc.priority, tc.category
+                """)
+                
+                total_test_cases = 0
+                by_priority = {}
+                category_counts = {}
+                for priority, category, count in cursor.fetchall():
+                    total_test_cases += count
+                    by_priority[priority] = by_priority.get(priority, 0) + count
+                    category_counts[category] = category_counts.get(category, 0) + count
+                
+                # Top 10 categories
+                by_category = dict(
+                    sorted(category_counts.items(), key=lambda item: item[1], reverse=True)[:10]
+                )
+                
+                statistics = {
+                    'total_generations': total_generations,
+                    'total_test_cases': total_test_cases,
+                    'by_priority': by_priority,
+                    'by_category': by_category
+                }
+                self._statistics_cache = (cache_key, statistics)
+            
+            return copy.deepcopy(statistics)
             
         except Exception as e:
             logger.error(f"Failed to get statistics: {e}")
             return {}
     
-    def cleanup_orphaned_records(self) -> int:
+    def cleanup_orphaned_records(self, min_interval_days: int = 7) -> int:
         """
         Remove orphaned test cases and coverage gaps that have no parent generation.
         This is a safeguard in case CASCADE delete doesn't work properly.
         
+        With foreign keys enabled orphans should not appear, so a clean database
+        is only probed with a read, and the deletes only run if the last cleanup
+        is older than min_interval_days.
+        
+        Args:
+            min_interval_days: Skip if a cleanup ran within this many days (0 to force)
+        
         Returns:
             Number of orphaned records cleaned up
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Delete orphaned test cases
-            cursor.execute("""
-                DELETE FROM test_cases 
-                WHERE generation_id NOT IN (SELECT id FROM generations)
-            """)
-            test_cases_deleted = cursor.rowcount
-            
-            # Delete orphaned coverage gaps
-            cursor.execute("""
-                DELETE FROM coverage_gaps 
-                WHERE generation_id NOT IN (SELECT id FROM generations)
-            """)
-            coverage_gaps_deleted = cursor.rowcount
-            
-            conn.commit()
-            conn.close()
+            with self._lock, self._conn:
+                cursor = self._conn.cursor()
+                
+                cursor.execute("""
+                    SELECT 1 FROM _meta
+                    WHERE key = 'last_cleanup' AND value > datetime('now', ?)
+                """, (f"-{min_interval_days} days",))
+                if cursor.fetchone():
+                    return 0
+                
+                # Cheap indexed read first so a clean database never takes the write lock
+                cursor.execute("""
+                    SELECT EXISTS (
+                        SELECT 1 FROM test_cases tc
+                        WHERE NOT EXISTS (SELECT 1 FROM generations g WHERE g.id = tc.generation_id)
+                    ) OR EXISTS (
+                        SELECT 1 FROM coverage_gaps cg
+                        WHERE NOT EXISTS (SELECT 1 FROM generations g WHERE g.id = cg.generation_id)
+                    )
+                """)
+                if not cursor.fetchone()[0]:
+                    return 0
+                
+                # Recorded in the same transaction as the deletes below
+                cursor.execute("""
+                    INSERT OR REPLACE INTO _meta (key, value)
+                    VALUES ('last_cleanup', datetime('now'))
+                """)
+                
+                # Delete orphaned test cases
+                cursor.execute("""
+                    DELETE FROM test_cases 
+                    WHERE NOT EXISTS (SELECT 1 FROM generations g WHERE g.id = test_cases.generation_id)
+                """)
+                test_cases_deleted = cursor.rowcount
+                
+                # Delete orphaned coverage gaps
+                cursor.execute("""
+                    DELETE FROM coverage_gaps 
+                    WHERE NOT EXISTS (SELECT 1 FROM generations g WHERE g.id = coverage_gaps.generation_id)
+                """)
+                coverage_gaps_deleted = cursor.rowcount
+                self._write_version += 1
             
             total_deleted = test_cases_deleted + coverage_gaps_deleted
             if total_deleted > 0:
@@ -472,3 +677,33 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Failed to cleanup orphaned records: {e}")
             return 0
+    
+    def close(self):
+        """Close the underlying database connections"""
+        if self._read_conn is not self._conn:
+            with self._read_lock:
+                self._read_conn.close()
+        with self._lock:
+            self._conn.close()
+
+
+# Global database manager instance
+_global_db_manager = None
+
+
+def get_db_manager(db_path: str = "ticket_test.db") -> DatabaseManager:
+    """
+    Get or create the global database manager instance
+    
+    Args:
+        db_path: Path to SQLite database file
+    
+    Returns:
+        DatabaseManager instance
+    """
+    global _global_db_manager
+    
+    if _global_db_manager is None:
+        _global_db_manager = DatabaseManager(db_path)
+    
+    return _global_db_manager
@@ -7,7 +7,7 @@ from datetime import datetime
 import json
 
 
-@dataclass
+@dataclass(slots=True)
 class Generation:
     """Represents a test generation session"""
     id: str
@@ -33,7 +33,7 @@ class Generation:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class TestCase:
     """Represents a single test case"""
     generation_id: str
@@ -67,7 +67,7 @@ class TestCase:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class CoverageGap:
     """Represents a coverage gap"""
     generation_id: str
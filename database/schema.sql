@@ -19,6 +19,8 @@ CREATE TABLE IF NOT EXISTS generations (
 -- Index for faster ticket_id lookups
 CREATE INDEX IF NOT EXISTS idx_generations_ticket_id ON generations(ticket_id);
 CREATE INDEX IF NOT EXISTS idx_generations_timestamp ON generations(timestamp DESC);
+-- Index for search_generations filtered by type (already ordered by timestamp)
+CREATE INDEX IF NOT EXISTS idx_generations_type_timestamp ON generations(ticket_type, timestamp DESC);
 
 -- Table for storing individual test cases
 CREATE TABLE IF NOT EXISTS test_cases (
@@ -49,3 +51,9 @@ CREATE TABLE IF NOT EXISTS coverage_gaps (
 
 -- Index for faster generation_id lookups
 CREATE INDEX IF NOT EXISTS idx_coverage_gaps_generation_id ON coverage_gaps(generation_id);
+
+-- Table for internal bookkeeping (e.g. when orphan cleanup last ran)
+CREATE TABLE IF NOT EXISTS _meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
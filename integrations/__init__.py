@@ -1,6 +1,15 @@
 """Integrations package for Jira and Azure DevOps"""
 from integrations.base import TicketIntegration
-from integrations.jira_integration import JiraIntegration
-from integrations.azure_devops_integration import AzureDevOpsIntegration
 
 __all__ = ['TicketIntegration', 'JiraIntegration', 'AzureDevOpsIntegration']
+
+
+def __getattr__(name):
+    # The Jira and Azure DevOps SDKs are slow to import, so load them on first access
+    if name == 'JiraIntegration':
+        from integrations.jira_integration import JiraIntegration
+        return JiraIntegration
+    if name == 'AzureDevOpsIntegration':
+        from integrations.azure_devops_integration import AzureDevOpsIntegration
+        return AzureDevOpsIntegration
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,19 +2,137 @@
 Azure DevOps Integration
 Connects to Azure DevOps and manages work item operations
 """
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+import copy
+import html
 import os
-from azure.devops.connection import Connection
-from azure.devops.v7_0.work_item_tracking import WorkItemTrackingClient
-from msrest.authentication import BasicAuthentication
+import random
+import threading
+import time
+from urllib3.util.retry import Retry
 import logging
 
 from integrations.base import TicketIntegration
 from agents.state import TicketInfo
 
+if TYPE_CHECKING:
+    # The azure-devops SDK pulls in hundreds of generated model classes, so it
+    # is only imported once connect() actually needs it
+    from azure.devops.connection import Connection
+    from azure.devops.v7_0.work_item_tracking import WorkItemTrackingClient
+
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of IDs accepted by the work items batch endpoint
+WORK_ITEMS_BATCH_SIZE = 200
+
+# Transient statuses retried by the HTTP transport on the read-only client.
+# 429/503 carry Retry-After, which is honoured; the 5xx codes match msrest's
+# own default retry policy. Writes go through a separate client that never
+# resends a request the server may already have acted on
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 5
+
+# Work items are read with their relations only. 'All' also returns every
+# _links entry, which we never use; the REST API rejects a `fields` filter
+# combined with a relations expand, so trimming fields isn't an option here
+WORK_ITEM_EXPAND = 'Relations'
+
+# Upper bound on concurrent requests issued against the REST API
+MAX_CONCURRENT_REQUESTS = 8
+
+# Read size used when streaming attachment uploads
+UPLOAD_BLOCK_SIZE = 1 << 20  # 1 MiB
+
+# fetch_ticket cache bounds: entries kept and seconds before an entry must be
+# revalidated against the work item's current revision
+TICKET_CACHE_MAXSIZE = 2048
+TICKET_CACHE_TTL = 60
+
+# WIQL result cache bounds; only the matching IDs are cached, so this can be
+# short-lived without affecting the freshness of the ticket details
+QUERY_CACHE_MAXSIZE = 256
+QUERY_CACHE_TTL = 30
+
+# Azure DevOps work item type -> standard ticket type
+_TICKET_TYPE_MAP = {
+    'Bug': 'bug',
+    'User Story': 'story',
+    'Task': 'task',
+    'Feature': 'feature'
+}
+
+# Azure DevOps priorities 1-4, indexed by priority - 1
+_PRIORITY_LEVELS = ('P0', 'P1', 'P2', 'P3')
+
+# Bullet markers and list numbering stripped from the start of each criterion
+_BULLET_CHARS = '*-•·○►0123456789.() '
+
+
+def _escape_html(value) -> str:
+    """Escape plain test case text for inclusion in an HTML description"""
+    return html.escape(str(value), quote=False)
+
+
+class _AcceptanceCriteriaParser(HTMLParser):
+    """
+    Collect list items and line-separated text from Azure DevOps rich text
+    
+    Azure DevOps stores acceptance criteria as HTML, usually an <ol>/<ul> or
+    a sequence of <div>/<br> separated lines, so block tags become line breaks.
+    """
+    
+    BLOCK_TAGS = frozenset({
+        'br', 'div', 'p', 'ul', 'ol', 'li', 'tr',
+        'h1', 'h2', 'h3', 'h4', 'h5', 'h6'
+    })
+    
+    def __init__(self):
+        super().__init__()
+        self.list_items: List[str] = []
+        self.text_parts: List[str] = []
+        self._item_parts: List[str] = []
+        self._list_item_depth = 0
+    
+    def _flush_item(self):
+        item = ' '.join(''.join(self._item_parts).split())
+        if item:
+            self.list_items.append(item)
+        self._item_parts = []
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.BLOCK_TAGS:
+            self.text_parts.append('\n')
+        if tag == 'li':
+            # A nested list ends the text of its parent item
+            if self._list_item_depth:
+                self._flush_item()
+            self._list_item_depth += 1
+    
+    def handle_endtag(self, tag):
+        if tag in self.BLOCK_TAGS:
+            self.text_parts.append('\n')
+        if tag == 'li' and self._list_item_depth:
+            self._flush_item()
+            self._list_item_depth -= 1
+    
+    def handle_data(self, data):
+        self.text_parts.append(data)
+        if self._list_item_depth:
+            self._item_parts.append(data)
+
+
+class _JitteredRetry(Retry):
+    """urllib3 Retry with full jitter, so throttled workers don't retry in lockstep"""
+    
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff else 0
+
 
 class AzureDevOpsIntegration(TicketIntegration):
     """
@@ -38,8 +156,15 @@ class AzureDevOpsIntegration(TicketIntegration):
         self.organization_url = organization_url or os.getenv('AZURE_DEVOPS_ORG')
         self.pat = personal_access_token or os.getenv('AZURE_DEVOPS_PAT')
         self.project = project or os.getenv('AZURE_DEVOPS_PROJECT')
-        self.connection: Optional[Connection] = None
-        self.wit_client: Optional[WorkItemTrackingClient] = None
+        self.connection: Optional["Connection"] = None
+        self.wit_client: Optional["WorkItemTrackingClient"] = None
+        # Used for creates, updates and uploads, with status and read retries off
+        self._write_client: Optional["WorkItemTrackingClient"] = None
+        # ticket_id -> (expires_at, rev, TicketInfo), least recently used first
+        self._ticket_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # (normalized WIQL, top) -> (expires_at, [work item IDs]), least recently used first
+        self._query_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def connect(self) -> bool:
         """
@@ -53,9 +178,40 @@ class AzureDevOpsIntegration(TicketIntegration):
                 logger.error("Missing Azure DevOps credentials. Set AZURE_DEVOPS_ORG and AZURE_DEVOPS_PAT")
                 return False
             
+            from azure.devops.connection import Connection
+            from msrest.authentication import BasicAuthentication
+            
             credentials = BasicAuthentication('', self.pat)
             self.connection = Connection(base_url=self.organization_url, creds=credentials)
             self.wit_client = self.connection.clients.get_work_item_tracking_client()
+            # msrest's default policy treats 429 as final; back off and retry it
+            # (and transient 5xx) at the transport level. This client only issues
+            # reads, so POSTs (WIQL, work items batch) are safe to resend
+            self._configure_client(self.wit_client, _JitteredRetry(
+                total=MAX_RETRIES,
+                connect=3,
+                read=3,
+                status=MAX_RETRIES,
+                backoff_factor=0.5,
+                status_forcelist=RETRY_STATUS_CODES,
+                allowed_methods=None,
+                respect_retry_after_header=True
+            ))
+            
+            # Connection caches one client per type, so writes need their own
+            # connection to get an independently configured client. Only
+            # connection errors are retried (the request never reached the
+            # server); a created work item or a consumed upload stream must not
+            # be sent twice
+            write_connection = Connection(base_url=self.organization_url, creds=credentials)
+            self._write_client = write_connection.clients.get_work_item_tracking_client()
+            self._configure_client(self._write_client, _JitteredRetry(
+                total=3,
+                connect=3,
+                read=0,
+                status=0,
+                backoff_factor=0.5
+            ))
             
             logger.info(f"Successfully connected to Azure DevOps at {self.organization_url}")
             return True
@@ -64,6 +220,17 @@ class AzureDevOpsIntegration(TicketIntegration):
             logger.error(f"Failed to connect to Azure DevOps: {e}")
             return False
     
+    @staticmethod
+    def _configure_client(client: "WorkItemTrackingClient", retry: Retry):
+        """Apply the shared transport settings and the given retry policy to a client"""
+        # msrest closes its requests.Session after every call unless keep_alive
+        # is set, forcing a new TCP/TLS handshake per request
+        client.config.keep_alive = True
+        # Attachments are streamed from disk in blocks of this size (msrest's
+        # default of 4 KiB means thousands of tiny writes for a large file)
+        client.config.connection.data_block_size = UPLOAD_BLOCK_SIZE
+        client.config.retry_policy.policy = retry
+    
     def fetch_ticket(self, ticket_id: str) -> Optional[TicketInfo]:
         """
         Fetch a single work item from Azure DevOps
@@ -74,82 +241,35 @@ class AzureDevOpsIntegration(TicketIntegration):
         Returns:
             TicketInfo if found, None otherwise
         """
+        ticket_id = str(ticket_id)
+        entry = self._get_cache_entry(ticket_id)
+        if entry is not None and entry[0] > time.monotonic():
+            # Callers may mutate the returned dict, so never hand out the cached one
+            return copy.deepcopy(entry[2])
+        
         if not self.wit_client:
             if not self.connect():
                 return None
         
         try:
             work_item_id = int(ticket_id)
+            
+            if entry is not None:
+                # Expired entry: revalidate against the current revision with a
+                # fields-only read before downloading the full work item again
+                _, cached_rev, cached_ticket = entry
+                current = self.wit_client.get_work_item(work_item_id, fields=['System.Rev'])
+                if current.rev == cached_rev:
+                    self._cache_ticket(cached_ticket, cached_rev)
+                    return copy.deepcopy(cached_ticket)
+            
             work_item = self.wit_client.get_work_item(
                 work_item_id,
-                expand='All'
+                expand=WORK_ITEM_EXPAND
             )
             
-            fields = work_item.fields
-            
-            # Extract basic fields
-            title = fields.get('System.Title', '')
-            description = fields.get('System.Description', '')
-            work_item_type = fields.get('System.WorkItemType', 'Task')
-            state = fields.get('System.State', 'New')
-            priority = str(fields.get('Microsoft.VSTS.Common.Priority', '2'))
-            
-            # Extract acceptance criteria
-            acceptance_criteria_text = fields.get('Microsoft.VSTS.Common.AcceptanceCriteria', '')
-            acceptance_criteria = self._extract_acceptance_criteria(acceptance_criteria_text)
-            
-            # Get comments
-            comments = []
-            if work_item.relations:
-                comment_relations = [r for r in work_item.relations if r.rel == 'AttachedFile']
-                for rel in comment_relations[:5]:  # Last 5
-                    comments.append({
-                        'author': 'Unknown',  # ADO doesn't provide this easily
-                        'body': rel.attributes.get('name', ''),
-                        'created': ''
-                    })
-            
-            # Get attachments
-            attachments = []
-            if work_item.relations:
-                attachment_relations = [r for r in work_item.relations if r.rel == 'AttachedFile']
-                attachments = [rel.attributes.get('name', '') for rel in attachment_relations]
-            
-            # Get linked work items
-            linked_tickets = []
-            if work_item.relations:
-                link_relations = [r for r in work_item.relations if 'workitems' in r.url.lower()]
-                for rel in link_relations:
-                    # Extract ID from URL
-                    url_parts = rel.url.split('/')
-                    if url_parts:
-                        linked_tickets.append(url_parts[-1])
-            
-            # Map work item type to standard types
-            ticket_type_map = {
-                'Bug': 'bug',
-                'User Story': 'story',
-                'Task': 'task',
-                'Feature': 'feature'
-            }
-            ticket_type = ticket_type_map.get(work_item_type, work_item_type.lower())
-            
-            # Map priority (ADO uses 1-4, convert to P0-P3)
-            priority_map = {'1': 'P0', '2': 'P1', '3': 'P2', '4': 'P3'}
-            priority = priority_map.get(priority, 'P2')
-            
-            ticket_info = TicketInfo(
-                ticket_id=str(work_item_id),
-                title=title,
-                description=description,
-                acceptance_criteria=acceptance_criteria,
-                ticket_type=ticket_type,
-                priority=priority,
-                status=state,
-                attachments=attachments,
-                comments=comments,
-                linked_tickets=linked_tickets
-            )
+            ticket_info = self._work_item_to_ticket_info(work_item)
+            self._cache_ticket(ticket_info, work_item.rev)
             
             logger.info(f"Successfully fetched Azure DevOps work item: {ticket_id}")
             return ticket_info
@@ -158,7 +278,145 @@ class AzureDevOpsIntegration(TicketIntegration):
             logger.error(f"Failed to fetch Azure DevOps work item {ticket_id}: {e}")
             return None
     
-    def _extract_acceptance_criteria(self, ac_text: str) -> List[str]:
+    def _get_cache_entry(self, ticket_id: str) -> Optional[tuple]:
+        """Return the (expires_at, rev, TicketInfo) cache entry, expired or not"""
+        with self._cache_lock:
+            entry = self._ticket_cache.get(ticket_id)
+            if entry is not None:
+                self._ticket_cache.move_to_end(ticket_id)
+            return entry
+    
+    def _cache_ticket(self, ticket_info: TicketInfo, rev: Optional[int]) -> None:
+        """Store a ticket in the cache, evicting the least recently used entry"""
+        with self._cache_lock:
+            self._ticket_cache[ticket_info['ticket_id']] = (
+                time.monotonic() + TICKET_CACHE_TTL,
+                rev,
+                copy.deepcopy(ticket_info)
+            )
+            self._ticket_cache.move_to_end(ticket_info['ticket_id'])
+            while len(self._ticket_cache) > TICKET_CACHE_MAXSIZE:
+                self._ticket_cache.popitem(last=False)
+    
+    def _invalidate_ticket(self, ticket_id: str) -> None:
+        """Drop a ticket from the cache after it has been modified"""
+        with self._cache_lock:
+            self._ticket_cache.pop(str(ticket_id), None)
+    
+    def cache_clear(self) -> None:
+        """Drop all cached tickets"""
+        with self._cache_lock:
+            self._ticket_cache.clear()
+    
+    def clear_query_cache(self) -> None:
+        """Drop all cached WIQL query results"""
+        with self._cache_lock:
+            self._query_cache.clear()
+    
+    def _query_work_item_ids(self, wiql: str, top: Optional[int] = None) -> List[int]:
+        """
+        Run a WIQL query and return the matching work item IDs
+        
+        Results are cached for QUERY_CACHE_TTL seconds, keyed by the query with
+        its whitespace normalized and the result limit.
+        
+        Args:
+            wiql: WIQL query string
+            top: Maximum number of IDs the server should return (None for all)
+        """
+        from azure.devops.v7_0.work_item_tracking.models import Wiql
+        
+        key = (' '.join(wiql.split()), top)
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._query_cache.get(key)
+            if entry is not None and entry[0] > now:
+                self._query_cache.move_to_end(key)
+                return entry[1]
+        
+        # Limit on the server rather than slicing up to 20k refs client-side
+        result = self.wit_client.query_by_wiql(Wiql(query=wiql), top=top)
+        work_item_ids = [ref.id for ref in result.work_items]
+        
+        with self._cache_lock:
+            self._query_cache[key] = (now + QUERY_CACHE_TTL, work_item_ids)
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > QUERY_CACHE_MAXSIZE:
+                self._query_cache.popitem(last=False)
+        
+        return work_item_ids
+    
+    @classmethod
+    def _work_item_to_ticket_info(cls, work_item) -> TicketInfo:
+        """
+        Convert an Azure DevOps WorkItem into TicketInfo
+        
+        Shared by fetch_ticket and the batched search path; it makes no requests.
+        
+        Args:
+            work_item: WorkItem returned by the SDK (fetched with relations)
+        
+        Returns:
+            TicketInfo for the work item
+        """
+        fields = work_item.fields
+        
+        # Extract basic fields
+        title = fields.get('System.Title', '')
+        description = fields.get('System.Description', '')
+        work_item_type = fields.get('System.WorkItemType', 'Task')
+        state = fields.get('System.State', 'New')
+        priority = fields.get('Microsoft.VSTS.Common.Priority', 2)
+        
+        # Extract acceptance criteria
+        acceptance_criteria_text = fields.get('Microsoft.VSTS.Common.AcceptanceCriteria', '')
+        acceptance_criteria = cls._extract_acceptance_criteria(acceptance_criteria_text)
+        
+        # Get comments, attachments and linked work items in one pass over relations
+        comments = []
+        attachments = []
+        linked_tickets = []
+        for rel in work_item.relations or ():
+            if rel.rel == 'AttachedFile':
+                name = rel.attributes.get('name', '') if rel.attributes else ''
+                attachments.append(name)
+                if len(comments) < 5:  # Last 5
+                    comments.append({
+                        'author': 'Unknown',  # ADO doesn't provide this easily
+                        'body': name,
+                        'created': ''
+                    })
+            if 'workitems' in rel.url.lower():
+                # Extract ID from URL
+                linked_tickets.append(rel.url.rsplit('/', 1)[-1])
+        
+        # Map work item type to standard types
+        ticket_type = _TICKET_TYPE_MAP.get(work_item_type) or work_item_type.lower()
+        
+        # Map priority (ADO uses 1-4, convert to P0-P3)
+        try:
+            priority_level = int(priority)
+        except (TypeError, ValueError):
+            priority_level = 0
+        priority = _PRIORITY_LEVELS[priority_level - 1] if 1 <= priority_level <= len(_PRIORITY_LEVELS) else 'P2'
+        
+        ticket_info = TicketInfo(
+            ticket_id=str(work_item.id),
+            title=title,
+            description=description,
+            acceptance_criteria=acceptance_criteria,
+            ticket_type=ticket_type,
+            priority=priority,
+            status=state,
+            attachments=attachments,
+            comments=comments,
+            linked_tickets=linked_tickets
+        )
+        
+        return ticket_info
+    
+    @staticmethod
+    def _extract_acceptance_criteria(ac_text: str) -> List[str]:
         """
         Extract acceptance criteria from text
         
@@ -171,18 +429,20 @@ class AzureDevOpsIntegration(TicketIntegration):
         if not ac_text:
             return []
         
-        # Remove HTML tags (basic cleanup)
-        import re
-        clean_text = re.sub('<[^<]+?>', '', ac_text)
+        # Parse the HTML rather than regex-stripping tags; prefer the real list
+        # items and fall back to the text split on block boundaries
+        parser = _AcceptanceCriteriaParser()
+        parser.feed(ac_text)
+        parser.close()
         
         criteria = []
-        lines = clean_text.split('\n')
+        lines = parser.list_items or ''.join(parser.text_parts).split('\n')
         
         for line in lines:
             line = line.strip()
             if line:
                 # Remove bullet points and numbering
-                cleaned = line.lstrip('*-•·○►123456789.() ')
+                cleaned = line.lstrip(_BULLET_CHARS)
                 if cleaned:
                     criteria.append(cleaned)
         
@@ -217,11 +477,12 @@ class AzureDevOpsIntegration(TicketIntegration):
                 )
             ]
             
-            self.wit_client.update_work_item(
+            self._write_client.update_work_item(
                 document=patch_document,
                 id=work_item_id
             )
             
+            self._invalidate_ticket(ticket_id)
             logger.info(f"Posted comment to Azure DevOps work item: {ticket_id}")
             return True
             
@@ -248,9 +509,10 @@ class AzureDevOpsIntegration(TicketIntegration):
         try:
             work_item_id = int(ticket_id)
             
-            # Upload attachment
+            # Upload attachment (the SDK streams the open file in
+            # UPLOAD_BLOCK_SIZE chunks rather than reading it into memory)
             with open(file_path, 'rb') as f:
-                attachment = self.wit_client.create_attachment(
+                attachment = self._write_client.create_attachment(
                     upload_stream=f,
                     file_name=filename
                 )
@@ -272,11 +534,12 @@ class AzureDevOpsIntegration(TicketIntegration):
                 )
             ]
             
-            self.wit_client.update_work_item(
+            self._write_client.update_work_item(
                 document=patch_document,
                 id=work_item_id
             )
             
+            self._invalidate_ticket(ticket_id)
             logger.info(f"Attached file {filename} to Azure DevOps work item: {ticket_id}")
             return True
             
@@ -294,28 +557,10 @@ class AzureDevOpsIntegration(TicketIntegration):
         Returns:
             List of linked work item IDs
         """
-        if not self.wit_client:
-            if not self.connect():
-                return []
-        
-        try:
-            work_item_id = int(ticket_id)
-            work_item = self.wit_client.get_work_item(work_item_id, expand='Relations')
-            
-            linked = []
-            if work_item.relations:
-                for relation in work_item.relations:
-                    if 'workitems' in relation.url.lower():
-                        # Extract ID from URL
-                        url_parts = relation.url.split('/')
-                        if url_parts:
-                            linked.append(url_parts[-1])
-            
-            return linked
-            
-        except Exception as e:
-            logger.error(f"Failed to get linked work items for {ticket_id}: {e}")
-            return []
+        # fetch_ticket reads the same relations and caches them, so a recently
+        # fetched work item is answered without another request
+        ticket = self.fetch_ticket(ticket_id)
+        return ticket['linked_tickets'] if ticket else []
     
     def search_tickets(self, wiql: str, max_results: int = 50) -> List[TicketInfo]:
         """
@@ -328,21 +573,8 @@ class AzureDevOpsIntegration(TicketIntegration):
         Returns:
             List of TicketInfo objects
         """
-        if not self.wit_client:
-            if not self.connect():
-                return []
-        
         try:
-            from azure.devops.v7_0.work_item_tracking.models import Wiql
-            
-            wiql_object = Wiql(query=wiql)
-            result = self.wit_client.query_by_wiql(wiql_object)
-            
-            tickets = []
-            for work_item_ref in result.work_items[:max_results]:
-                ticket = self.fetch_ticket(str(work_item_ref.id))
-                if ticket:
-                    tickets.append(ticket)
+            tickets = list(self.iter_search_tickets(wiql, max_results=max_results))
             
             logger.info(f"Found {len(tickets)} work items matching WIQL query")
             return tickets
@@ -351,6 +583,74 @@ class AzureDevOpsIntegration(TicketIntegration):
             logger.error(f"WIQL search failed: {e}")
             return []
     
+    def iter_search_tickets(
+        self,
+        wiql: str,
+        page_size: int = WORK_ITEMS_BATCH_SIZE,
+        max_results: Optional[int] = None
+    ) -> Iterator[TicketInfo]:
+        """
+        Lazily yield work items matching a WIQL query, one batch page at a time
+        
+        Only the current page (plus the next one, fetched in the background)
+        is held in memory, so large result sets can be processed as they arrive.
+        
+        Args:
+            wiql: WIQL query string
+            page_size: Work items per batch request (at most WORK_ITEMS_BATCH_SIZE)
+            max_results: Maximum number of results (None for all)
+        
+        Yields:
+            TicketInfo objects in query order
+        """
+        if not self.wit_client:
+            if not self.connect():
+                return
+        
+        work_item_ids = self._query_work_item_ids(wiql, top=max_results)
+        if max_results is not None:
+            work_item_ids = work_item_ids[:max_results]  # Defensive; the server applies `top`
+        page_size = min(page_size, WORK_ITEMS_BATCH_SIZE)
+        pages = [
+            work_item_ids[start:start + page_size]
+            for start in range(0, len(work_item_ids), page_size)
+        ]
+        if not pages:
+            return
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self._get_work_items_batch, pages[0])
+            for index in range(len(pages)):
+                work_items = pending.result()
+                # Start fetching the next page while this one is being consumed
+                if index + 1 < len(pages):
+                    pending = executor.submit(self._get_work_items_batch, pages[index + 1])
+                
+                for work_item in work_items:
+                    if work_item:
+                        ticket = self._work_item_to_ticket_info(work_item)
+                        self._cache_ticket(ticket, work_item.rev)
+                        yield ticket
+    
+    def _get_work_items_batch(self, work_item_ids: List[int]) -> List:
+        """
+        Fetch up to WORK_ITEMS_BATCH_SIZE work items in a single request
+        
+        Args:
+            work_item_ids: Work item IDs to fetch
+        
+        Returns:
+            List of WorkItems (missing or inaccessible items are None)
+        """
+        from azure.devops.v7_0.work_item_tracking.models import WorkItemBatchGetRequest
+        
+        batch_request = WorkItemBatchGetRequest(
+            ids=work_item_ids,
+            expand=WORK_ITEM_EXPAND,
+            error_policy='omit'  # Skip items that were deleted or aren't accessible
+        )
+        return self.wit_client.get_work_items_batch(batch_request) or []
+    
     def create_test_tasks(
         self,
         parent_ticket_id: str,
@@ -377,73 +677,101 @@ class AzureDevOpsIntegration(TicketIntegration):
             return []
         
         created_tasks = []
+        tasks_to_create = test_cases[:max_tasks]
+        if not tasks_to_create:
+            return created_tasks
         
         try:
             from azure.devops.v7_0.work_item_tracking.models import JsonPatchOperation
             
-            for i, test_case in enumerate(test_cases[:max_tasks]):
-                # Create task
-                patch_document = [
-                    JsonPatchOperation(
-                        op='add',
-                        path='/fields/System.Title',
-                        value=f"[TEST] {test_case.get('title', 'Test Case')}"
-                    ),
-                    JsonPatchOperation(
-                        op='add',
-                        path='/fields/System.Description',
-                        value=self._format_test_case_description(test_case)
-                    )
-                ]
-                
-                task = self.wit_client.create_work_item(
-                    document=patch_document,
-                    project=self.project,
-                    type='Task'
-                )
-                
-                # Link to parent
-                link_patch = [
-                    JsonPatchOperation(
-                        op='add',
-                        path='/relations/-',
-                        value={
-                            'rel': 'System.LinkTypes.Hierarchy-Reverse',
-                            'url': f"{self.organization_url}/{self.project}/_apis/wit/workItems/{parent_ticket_id}"
-                        }
-                    )
-                ]
-                
-                self.wit_client.update_work_item(
-                    document=link_patch,
-                    id=task.id
+            # The parent link is identical for every task, so build it once and
+            # share it (the SDK only reads it while serializing each request)
+            parent_link = JsonPatchOperation(
+                op='add',
+                path='/relations/-',
+                value={
+                    'rel': 'System.LinkTypes.Hierarchy-Reverse',
+                    'url': f"{self.organization_url}/{self.project}/_apis/wit/workItems/{parent_ticket_id}"
+                }
+            )
+            
+            # Each task is independent network-bound work, so create them concurrently
+            with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(tasks_to_create))) as executor:
+                results = executor.map(
+                    lambda test_case: self._create_test_task(parent_link, test_case),
+                    tasks_to_create
                 )
-                
-                created_tasks.append(str(task.id))
-                logger.info(f"Created test task: {task.id}")
+                created_tasks = [task_id for task_id in results if task_id]
             
             return created_tasks
             
         except Exception as e:
             logger.error(f"Failed to create test tasks: {e}")
             return created_tasks
+        finally:
+            # The parent gained child links, so its cached relations are stale
+            if created_tasks:
+                self._invalidate_ticket(parent_ticket_id)
+    
+    def _create_test_task(self, parent_link, test_case: Dict) -> Optional[str]:
+        """
+        Create a single test task linked to its parent work item
+        
+        Args:
+            parent_link: JsonPatchOperation adding the parent relation
+            test_case: Test case dictionary
+        
+        Returns:
+            ID of the created task, or None if it failed
+        """
+        try:
+            from azure.devops.v7_0.work_item_tracking.models import JsonPatchOperation
+            
+            # Create the task and link it to its parent in a single request
+            patch_document = [
+                JsonPatchOperation(
+                    op='add',
+                    path='/fields/System.Title',
+                    value=f"[TEST] {test_case.get('title', 'Test Case')}"
+                ),
+                JsonPatchOperation(
+                    op='add',
+                    path='/fields/System.Description',
+                    value=self._format_test_case_description(test_case)
+                ),
+                parent_link
+            ]
+            
+            task = self._write_client.create_work_item(
+                document=patch_document,
+                project=self.project,
+                type='Task'
+            )
+            
+            logger.info(f"Created test task: {task.id}")
+            return str(task.id)
+            
+        except Exception as e:
+            logger.error(f"Failed to create test task '{test_case.get('title', 'Test Case')}': {e}")
+            return None
     
     def _format_test_case_description(self, test_case: Dict) -> str:
         """Format test case as HTML description"""
-        description = f"<b>Priority:</b> {test_case.get('priority', 'P2')}<br>"
-        description += f"<b>Category:</b> {test_case.get('category', 'Unknown')}<br><br>"
+        parts = [
+            f"<b>Priority:</b> {_escape_html(test_case.get('priority', 'P2'))}<br>",
+            f"<b>Category:</b> {_escape_html(test_case.get('category', 'Unknown'))}<br><br>"
+        ]
         
         if test_case.get('preconditions'):
-            description += f"<b>Preconditions:</b><br>{test_case['preconditions']}<br><br>"
+            parts.append(f"<b>Preconditions:</b><br>{_escape_html(test_case['preconditions'])}<br><br>")
         
-        description += "<b>Test Steps:</b><br><ol>"
-        for step in test_case.get('test_steps', []):
-            description += f"<li>{step}</li>"
-        description += "</ol>"
+        parts.append("<b>Test Steps:</b><br><ol>")
+        parts.extend(f"<li>{_escape_html(step)}</li>" for step in test_case.get('test_steps', []))
+        parts.append("</ol>")
         
-        description += f"<br><b>Expected Result:</b><br>{test_case.get('expected_result', '')}<br>"
+        parts.append(f"<br><b>Expected Result:</b><br>{_escape_html(test_case.get('expected_result', ''))}<br>")
         
         if test_case.get('test_data'):
-            description += f"<br><b>Test Data:</b><br>{test_case['test_data']}<br>"
+            parts.append(f"<br><b>Test Data:</b><br>{_escape_html(test_case['test_data'])}<br>")
         
-        return description
+        return ''.join(parts)
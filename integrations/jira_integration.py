@@ -2,24 +2,77 @@
 Jira Integration
 Connects to Jira Cloud/Server and manages ticket operations
 """
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
+from collections import OrderedDict
+import copy
+import hashlib
 import os
-from jira import JIRA
-from jira.exceptions import JIRAError
+import re
+import threading
 import logging
 
 from integrations.base import TicketIntegration
 from agents.state import TicketInfo
 
+if TYPE_CHECKING:
+    # The jira SDK (and requests_toolbelt, defusedxml, ...) is slow to import,
+    # so it is only loaded once connect() actually needs it
+    from jira import JIRA
+
 
 logger = logging.getLogger(__name__)
 
+# Issue fields read when building TicketInfo; requesting only these keeps
+# issue and search responses small
+TICKET_FIELDS = "summary,description,issuetype,priority,status,comment,attachment,issuelinks,updated"
+
+# Fetched tickets kept for revalidation by fetch_ticket
+TICKET_CACHE_MAXSIZE = 1024
+
+# Keys per JQL `key in (...)` query in fetch_tickets
+FETCH_BATCH_SIZE = 100
+
+# Markers that open the acceptance criteria section of a description
+_AC_HEADER_RE = re.compile(r'acceptance criteria|ac:|acceptance:', re.IGNORECASE)
+# Bullet markers and list numbering at the start of a criterion
+_AC_BULLET_RE = re.compile(r'^[*\-•·○►0-9.()\s]+')
+
+# Page size used when the jira client paginates searches on its own (the
+# library default is 50); servers clamp it to their own limit, e.g. 100 on Cloud
+SEARCH_BATCH_SIZE = 500
+
+# Maximum issues accepted by Jira's bulk create endpoint in one request
+BULK_CREATE_SIZE = 50
+
+# Connected clients shared by every JiraIntegration with the same credentials,
+# so their keep-alive connection pool survives re-creating the integration.
+# Keyed by a digest of the credentials (never the raw token), least recently
+# used first, and bounded so rotated tokens don't pin old clients forever
+_clients: "OrderedDict[str, JIRA]" = OrderedDict()
+_clients_lock = threading.Lock()
+CLIENT_CACHE_MAXSIZE = 16
+
+# HTTP statuses meaning the credentials were rejected or revoked
+_AUTH_ERROR_STATUSES = (401, 403)
+
+
+def _client_key(url: str, email: str, api_token: str) -> str:
+    """Cache key for a credential set"""
+    return hashlib.blake2b(
+        "\0".join((url, email, api_token)).encode('utf-8'),
+        digest_size=16
+    ).hexdigest()
+
 
 class JiraIntegration(TicketIntegration):
     """
     Integration with Jira (Cloud or Server)
     """
     
+    # jira.exceptions.JIRAError once connect() has imported the SDK; an empty
+    # tuple matches nothing, so `except self._JIRAError` is safe before that
+    _JIRAError = ()
+    
     def __init__(
         self, 
         url: Optional[str] = None,
@@ -37,7 +90,10 @@ class JiraIntegration(TicketIntegration):
         self.url = url or os.getenv('JIRA_URL')
         self.email = email or os.getenv('JIRA_EMAIL')
         self.api_token = api_token or os.getenv('JIRA_API_TOKEN')
-        self.client: Optional[JIRA] = None
+        self.client: Optional["JIRA"] = None
+        # ticket key -> (issue `updated` timestamp, TicketInfo), least recently used first
+        self._ticket_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._ticket_cache_lock = threading.Lock()
     
     def connect(self) -> bool:
         """
@@ -51,23 +107,59 @@ class JiraIntegration(TicketIntegration):
                 logger.error("Missing Jira credentials. Set JIRA_URL, JIRA_EMAIL, JIRA_API_TOKEN")
                 return False
             
+            from jira import JIRA
+            from jira.exceptions import JIRAError
+            from jira.resources import Issue
+            self._JIRAError = JIRAError
+            
+            client_key = _client_key(self.url, self.email, self.api_token)
+            with _clients_lock:
+                client = _clients.get(client_key)
+                if client is not None:
+                    _clients.move_to_end(client_key)
+            if client is not None:
+                self.client = client
+                return True
+            
             self.client = JIRA(
                 server=self.url,
-                basic_auth=(self.email, self.api_token)
+                basic_auth=(self.email, self.api_token),
+                default_batch_sizes={Issue: SEARCH_BATCH_SIZE}
             )
             
             # Test connection
             self.client.myself()
+            with _clients_lock:
+                _clients[client_key] = self.client
+                _clients.move_to_end(client_key)
+                while len(_clients) > CLIENT_CACHE_MAXSIZE:
+                    _clients.popitem(last=False)
             logger.info(f"Successfully connected to Jira at {self.url}")
             return True
             
-        except JIRAError as e:
+        except self._JIRAError as e:
+            self._drop_client_on_auth_error(e)
             logger.error(f"Failed to connect to Jira: {e}")
             return False
         except Exception as e:
             logger.error(f"Unexpected error connecting to Jira: {e}")
             return False
     
+    def _drop_client_on_auth_error(self, error) -> None:
+        """
+        Forget the shared client if Jira rejected its credentials
+        
+        Args:
+            error: The JIRAError raised by a request
+        """
+        if getattr(error, 'status_code', None) not in _AUTH_ERROR_STATUSES:
+            return
+        
+        with _clients_lock:
+            _clients.pop(_client_key(self.url, self.email, self.api_token), None)
+        # The next call reconnects (and re-validates) instead of reusing it
+        self.client = None
+    
     def fetch_ticket(self, ticket_id: str) -> Optional[TicketInfo]:
         """
         Fetch a single ticket from Jira
@@ -83,50 +175,122 @@ class JiraIntegration(TicketIntegration):
                 return None
         
         try:
-            issue = self.client.issue(ticket_id)
-            
-            # Extract acceptance criteria from description or custom field
-            description = issue.fields.description or ""
-            acceptance_criteria = self._extract_acceptance_criteria(description)
+            with self._ticket_cache_lock:
+                cached = self._ticket_cache.get(ticket_id)
             
-            # Get comments
-            comments = []
-            for comment in issue.fields.comment.comments[-5:]:  # Last 5 comments
-                comments.append({
-                    'author': comment.author.displayName,
-                    'body': comment.body,
-                    'created': str(comment.created)
-                })
+            if cached is not None:
+                # Conditional fetch: read only the `updated` timestamp and reuse
+                # the cached ticket if the issue hasn't changed since
+                issue = self.client.issue(ticket_id, fields='updated')
+                if issue.fields.updated == cached[0]:
+                    with self._ticket_cache_lock:
+                        if ticket_id in self._ticket_cache:
+                            self._ticket_cache.move_to_end(ticket_id)
+                    # Callers may mutate the returned dict, so never hand out the cached one
+                    return copy.deepcopy(cached[1])
             
-            # Get attachments
-            attachments = [att.filename for att in issue.fields.attachment]
+            issue = self.client.issue(ticket_id, fields=TICKET_FIELDS)
+            ticket_info = self._issue_to_ticket_info(issue)
             
-            # Get linked issues
-            linked_tickets = [link.key for link in issue.fields.issuelinks if hasattr(link, 'key')]
-            
-            ticket_info = TicketInfo(
-                ticket_id=issue.key,
-                title=issue.fields.summary,
-                description=description,
-                acceptance_criteria=acceptance_criteria,
-                ticket_type=issue.fields.issuetype.name.lower(),
-                priority=issue.fields.priority.name if issue.fields.priority else "Medium",
-                status=issue.fields.status.name,
-                attachments=attachments,
-                comments=comments,
-                linked_tickets=linked_tickets
-            )
+            with self._ticket_cache_lock:
+                self._ticket_cache[ticket_id] = (issue.fields.updated, copy.deepcopy(ticket_info))
+                self._ticket_cache.move_to_end(ticket_id)
+                while len(self._ticket_cache) > TICKET_CACHE_MAXSIZE:
+                    self._ticket_cache.popitem(last=False)
             
             logger.info(f"Successfully fetched Jira ticket: {ticket_id}")
             return ticket_info
             
-        except JIRAError as e:
+        except self._JIRAError as e:
+            self._drop_client_on_auth_error(e)
             logger.error(f"Failed to fetch Jira ticket {ticket_id}: {e}")
             return None
         except Exception as e:
             logger.error(f"Unexpected error fetching Jira ticket {ticket_id}: {e}")
             return None
     
+    def fetch_tickets(self, ticket_ids: List[str]) -> List[TicketInfo]:
+        """
+        Fetch several tickets with one JQL search per FETCH_BATCH_SIZE keys
+        
+        Args:
+            ticket_ids: Ticket keys (e.g., ['PROJ-1', 'PROJ-2'])
+        
+        Returns:
+            TicketInfo for each ticket found, in the order requested
+        """
+        if not ticket_ids:
+            return []
+        
+        if not self.client:
+            if not self.connect():
+                return []
+        
+        found = {}
+        try:
+            for start in range(0, len(ticket_ids), FETCH_BATCH_SIZE):
+                keys = ticket_ids[start:start + FETCH_BATCH_SIZE]
+                key_list = ', '.join(f'"{key}"' for key in keys)
+                issues = self.client.search_issues(
+                    f"key in ({key_list})",
+                    maxResults=len(keys),
+                    fields=TICKET_FIELDS,
+                    validate_query=False  # Skip unknown keys instead of failing the whole batch
+                )
+                for issue in issues:
+                    found[issue.key] = self._issue_to_ticket_info(issue)
+        except self._JIRAError as e:
+            self._drop_client_on_auth_error(e)
+            logger.error(f"Failed to fetch Jira tickets {ticket_ids}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error fetching Jira tickets {ticket_ids}: {e}")
+        
+        return [found[key.upper()] for key in ticket_ids if key.upper() in found]
+    
+    def _issue_to_ticket_info(self, issue) -> TicketInfo:
+        """
+        Convert a Jira Issue into TicketInfo (no network I/O)
+        
+        Args:
+            issue: Issue returned by the client, with at least TICKET_FIELDS loaded
+        
+        Returns:
+            TicketInfo for the issue
+        """
+        # Extract acceptance criteria from description or custom field
+        description = issue.fields.description or ""
+        acceptance_criteria = self._extract_acceptance_criteria(description)
+        
+        # Get comments
+        comments = []
+        for comment in issue.fields.comment.comments[-5:]:  # Last 5 comments
+            comments.append({
+                'author': comment.author.displayName,
+                'body': comment.body,
+                'created': str(comment.created)
+            })
+        
+        # Get attachments
+        attachments = [att.filename for att in issue.fields.attachment]
+        
+        # Get linked issues
+        linked_tickets = [link.key for link in issue.fields.issuelinks if hasattr(link, 'key')]
+        
+        ticket_info = TicketInfo(
+            ticket_id=issue.key,
+            title=issue.fields.summary,
+            description=description,
+            acceptance_criteria=acceptance_criteria,
+            ticket_type=issue.fields.issuetype.name.lower(),
+            priority=issue.fields.priority.name if issue.fields.priority else "Medium",
+            status=issue.fields.status.name,
+            attachments=attachments,
+            comments=comments,
+            linked_tickets=linked_tickets
+        )
+        
+        return ticket_info
+    
     def _extract_acceptance_criteria(self, description: str) -> List[str]:
         """
         Extract acceptance criteria from description
@@ -138,7 +302,9 @@ class JiraIntegration(TicketIntegration):
         """
         criteria = []
         
-        if not description:
+        # One scan of the whole text rules out descriptions with no AC section
+        # before splitting them into lines
+        if not description or not _AC_HEADER_RE.search(description):
             return criteria
         
         # Look for acceptance criteria section
@@ -149,7 +315,7 @@ class JiraIntegration(TicketIntegration):
             line = line.strip()
             
             # Check if we're entering AC section
-            if any(marker in line.lower() for marker in ['acceptance criteria', 'ac:', 'acceptance:']):
+            if _AC_HEADER_RE.search(line):
                 in_ac_section = True
                 continue
             
@@ -160,7 +326,7 @@ class JiraIntegration(TicketIntegration):
             # Extract criteria
             if in_ac_section and line:
                 # Remove bullet points and numbering
-                cleaned = line.lstrip('*-•·○►123456789.() ')
+                cleaned = _AC_BULLET_RE.sub('', line)
                 if cleaned:
                     criteria.append(cleaned)
         
@@ -187,7 +353,8 @@ class JiraIntegration(TicketIntegration):
             self.client.add_comment(ticket_id, comment)
             logger.info(f"Posted comment to Jira ticket: {ticket_id}")
             return True
-        except JIRAError as e:
+        except self._JIRAError as e:
+            self._drop_client_on_auth_error(e)
             logger.error(f"Failed to post comment to {ticket_id}: {e.status_code} - {e.text}")
             return False
         except Exception as e:
@@ -226,7 +393,8 @@ class JiraIntegration(TicketIntegration):
                 )
             logger.info(f"Attached file {filename} to Jira ticket: {ticket_id}")
             return True
-        except JIRAError as e:
+        except self._JIRAError as e:
+            self._drop_client_on_auth_error(e)
             logger.error(f"Failed to attach file to {ticket_id}: {e.status_code} - {e.text}")
             return False
         except Exception as e:
@@ -248,7 +416,8 @@ class JiraIntegration(TicketIntegration):
                 return []
         
         try:
-            issue = self.client.issue(ticket_id)
+            # Only the links are needed, so skip every other field
+            issue = self.client.issue(ticket_id, fields='issuelinks')
             linked = []
             
             for link in issue.fields.issuelinks:
@@ -262,13 +431,14 @@ class JiraIntegration(TicketIntegration):
             logger.error(f"Failed to get linked tickets for {ticket_id}: {e}")
             return []
     
-    def search_tickets(self, jql: str, max_results: int = 50) -> List[TicketInfo]:
+    def search_tickets(self, jql: str, max_results: Optional[int] = 50) -> List[TicketInfo]:
         """
         Search for tickets using JQL
         
         Args:
             jql: Jira Query Language string
-            max_results: Maximum number of results
+            max_results: Maximum number of results (None for all matches,
+                fetched in SEARCH_BATCH_SIZE pages)
         
         Returns:
             List of TicketInfo objects
@@ -278,18 +448,26 @@ class JiraIntegration(TicketIntegration):
                 return []
         
         try:
-            issues = self.client.search_issues(jql, maxResults=max_results)
+            # The search response already carries every field TicketInfo needs,
+            # so convert the issues directly instead of re-fetching each one
+            issues = self.client.search_issues(
+                jql,
+                maxResults=max_results if max_results is not None else False,
+                fields=TICKET_FIELDS
+            )
             tickets = []
             
             for issue in issues:
-                ticket = self.fetch_ticket(issue.key)
-                if ticket:
-                    tickets.append(ticket)
+                try:
+                    tickets.append(self._issue_to_ticket_info(issue))
+                except Exception as e:
+                    logger.error(f"Unexpected error reading Jira ticket {issue.key}: {e}")
             
             logger.info(f"Found {len(tickets)} tickets matching JQL query")
             return tickets
             
-        except JIRAError as e:
+        except self._JIRAError as e:
+            self._drop_client_on_auth_error(e)
             logger.error(f"JQL search failed: {e}")
             return []
     
@@ -319,42 +497,80 @@ class JiraIntegration(TicketIntegration):
         created_subtasks = []
         
         try:
-            parent_issue = self.client.issue(parent_ticket_id)
+            parent_issue = self.client.issue(parent_ticket_id, fields='project')
             project_key = parent_issue.fields.project.key
             
             logger.info(f"Creating subtasks for {parent_ticket_id} in project {project_key}")
             
-            for i, test_case in enumerate(test_cases[:max_subtasks]):
+            # Build every payload up front (no I/O), then create them through the
+            # bulk endpoint, one request per BULK_CREATE_SIZE subtasks
+            subtask_dicts = [
+                {
+                    'project': {'key': project_key},
+                    'summary': f"[TEST] {test_case.get('title', 'Test Case')}",
+                    'description': self._format_test_case_description(test_case),
+                    'issuetype': {'name': 'Sub-task'},
+                    'parent': {'key': parent_ticket_id}
+                }
+                for test_case in test_cases[:max_subtasks]
+            ]
+            total = len(subtask_dicts)
+            
+            for start in range(0, total, BULK_CREATE_SIZE):
+                chunk = subtask_dicts[start:start + BULK_CREATE_SIZE]
                 try:
-                    subtask_dict = {
-                        'project': {'key': project_key},
-                        'summary': f"[TEST] {test_case.get('title', 'Test Case')}",
-                        'description': self._format_test_case_description(test_case),
-                        'issuetype': {'name': 'Sub-task'},
-                        'parent': {'key': parent_ticket_id}
-                    }
+                    # prefetch=False: the bulk response already carries the new keys
+                    results = self.client.create_issues(field_list=chunk, prefetch=False)
+                except self._JIRAError as e:
+                    if e.status_code in _AUTH_ERROR_STATUSES:
+                        raise
+                    # e.g. a server without /issue/bulk; create this chunk one by one
+                    logger.warning(f"Bulk create failed ({e.status_code}); creating subtasks {start + 1}-{start + len(chunk)} individually")
+                    results = [{'status': 'Error', 'issue': None} for _ in chunk]
+                
+                for index, (fields, result) in enumerate(zip(chunk, results), start + 1):
+                    if result.get('status') == 'Success' and result.get('issue'):
+                        created_subtasks.append(result['issue'].key)
+                        logger.info(f"Created test subtask {index}/{total}: {result['issue'].key}")
+                        continue
                     
-                    subtask = self.client.create_issue(fields=subtask_dict)
-                    created_subtasks.append(subtask.key)
-                    logger.info(f"Created test subtask {i+1}/{min(len(test_cases), max_subtasks)}: {subtask.key}")
-                except JIRAError as e:
-                    logger.error(f"Failed to create subtask {i+1}: {e.status_code} - {e.text}")
-                    # Continue with other subtasks
-                    continue
-                except Exception as e:
-                    logger.error(f"Unexpected error creating subtask {i+1}: {type(e).__name__} - {str(e)}")
-                    continue
+                    if result.get('error'):
+                        logger.warning(f"Bulk create rejected subtask {index}: {result['error']}; retrying individually")
+                    key = self._create_subtask(index, result.get('input_fields') or fields, total)
+                    if key:
+                        created_subtasks.append(key)
             
             logger.info(f"Successfully created {len(created_subtasks)} out of {min(len(test_cases), max_subtasks)} subtasks")
             return created_subtasks
             
-        except JIRAError as e:
-            logger.error(f"Failed to access parent ticket {parent_ticket_id}: {e.status_code} - {e.text}")
+        except self._JIRAError as e:
+            self._drop_client_on_auth_error(e)
+            logger.error(f"Jira request failed creating subtasks for {parent_ticket_id}: {e.status_code} - {e.text}")
             return created_subtasks
         except Exception as e:
             logger.error(f"Failed to create test subtasks: {type(e).__name__} - {str(e)}")
             return created_subtasks
     
+    def _create_subtask(self, index: int, subtask_dict: Dict, total: int) -> Optional[str]:
+        """
+        Create one test subtask, logging (not raising) failures other than auth errors
+        
+        Returns:
+            The created subtask key, or None if it failed
+        """
+        try:
+            subtask = self.client.create_issue(fields=subtask_dict)
+            logger.info(f"Created test subtask {index}/{total}: {subtask.key}")
+            return subtask.key
+        except self._JIRAError as e:
+            if e.status_code in _AUTH_ERROR_STATUSES:
+                raise
+            logger.error(f"Failed to create subtask {index}: {e.status_code} - {e.text}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error creating subtask {index}: {type(e).__name__} - {str(e)}")
+            return None
+    
     def _format_test_case_description(self, test_case: Dict) -> str:
         """Format test case as Jira description"""
         description = f"*Priority:* {test_case.get('priority', 'P2')}\n"
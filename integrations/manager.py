@@ -3,10 +3,9 @@ Integration Manager
 Factory for creating and managing ticket integrations
 """
 from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
 import os
 from integrations.base import TicketIntegration
-from integrations.jira_integration import JiraIntegration
-from integrations.azure_devops_integration import AzureDevOpsIntegration
 
 
 class IntegrationManager:
@@ -27,6 +26,8 @@ class IntegrationManager:
         """
         self.integrations: Dict[str, TicketIntegration] = {}
         self.custom_credentials = custom_credentials or {}
+        # is_configured results; the UI asks on every Streamlit rerun
+        self._configured: Dict[str, bool] = {}
     
     def get_integration(self, integration_type: str) -> Optional[TicketIntegration]:
         """
@@ -44,8 +45,10 @@ class IntegrationManager:
         if integration_type in self.integrations:
             return self.integrations[integration_type]
         
-        # Create new instance
+        # Create new instance (SDK-backed modules are imported on first use only)
         if integration_type == 'jira':
+            from integrations.jira_integration import JiraIntegration
+            
             # Use custom credentials if provided, otherwise fall back to environment
             jira_creds = self.custom_credentials.get('jira', {})
             integration = JiraIntegration(
@@ -58,6 +61,8 @@ class IntegrationManager:
                 return integration
         
         elif integration_type in ['azure_devops', 'ado', 'azure']:
+            from integrations.azure_devops_integration import AzureDevOpsIntegration
+            
             # Use custom credentials if provided, otherwise fall back to environment
             ado_creds = self.custom_credentials.get('azure_devops', {})
             integration = AzureDevOpsIntegration(
@@ -78,15 +83,31 @@ class IntegrationManager:
         Returns:
             TicketIntegration instance or None
         """
-        # Check for Jira credentials
+        # Integrations with credentials in the environment, in order of preference
+        candidates = []
         if all([os.getenv('JIRA_URL'), os.getenv('JIRA_EMAIL'), os.getenv('JIRA_API_TOKEN')]):
-            return self.get_integration('jira')
-        
-        # Check for Azure DevOps credentials
+            candidates.append('jira')
         if all([os.getenv('AZURE_DEVOPS_ORG'), os.getenv('AZURE_DEVOPS_PAT')]):
-            return self.get_integration('azure_devops')
+            candidates.append('azure_devops')
         
-        return None
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return self.get_integration(candidates[0])
+        
+        # Both are configured: probe the connections concurrently and keep the
+        # preferred one that succeeds (either way both end up in self.integrations)
+        executor = ThreadPoolExecutor(max_workers=len(candidates))
+        try:
+            futures = [executor.submit(self.get_integration, name) for name in candidates]
+            for future in futures:
+                integration = future.result()
+                if integration:
+                    return integration
+            return None
+        finally:
+            # Don't wait for a slower, lower-priority probe once we have a result
+            executor.shutdown(wait=False)
     
     def is_configured(self, integration_type: str) -> bool:
         """
@@ -99,7 +120,20 @@ class IntegrationManager:
             True if credentials are configured
         """
         integration_type = integration_type.lower()
+        if integration_type in ['ado', 'azure']:
+            integration_type = 'azure_devops'
         
+        configured = self._configured.get(integration_type)
+        if configured is None:
+            configured = self._configured[integration_type] = self._check_configured(integration_type)
+        return configured
+    
+    def refresh(self):
+        """Forget cached is_configured results (e.g. after the environment changed)"""
+        self._configured.clear()
+    
+    def _check_configured(self, integration_type: str) -> bool:
+        """Check custom credentials, then the environment, for an integration type"""
         if integration_type == 'jira':
             # Check custom credentials first
             jira_creds = self.custom_credentials.get('jira', {})
@@ -112,7 +146,7 @@ class IntegrationManager:
                 os.getenv('JIRA_API_TOKEN')
             ])
         
-        elif integration_type in ['azure_devops', 'ado', 'azure']:
+        elif integration_type == 'azure_devops':
             # Check custom credentials first
             ado_creds = self.custom_credentials.get('azure_devops', {})
             if all([ado_creds.get('org'), ado_creds.get('pat')]):
@@ -2,8 +2,11 @@
 Quick Test Script
 Run this to verify everything is working before demo
 """
+import io
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root to path
@@ -183,28 +186,84 @@ def test_full_pipeline():
         return False
 
 
+class _ThreadLocalStdout:
+    """sys.stdout proxy that sends each capturing thread's output to its own buffer"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def capture(self) -> io.StringIO:
+        """Route this thread's output to a fresh buffer"""
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+    
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer if buffer is not None else self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def __getattr__(self, name):
+        # encoding, isatty(), fileno(), ... come from the real stream
+        return getattr(self.stream, name)
+
+
+def run_test(name, test_func):
+    """Run a single test, treating an unexpected exception as a failure"""
+    try:
+        return test_func()
+    except Exception as e:
+        print(f"✗ {name} crashed: {e}")
+        return False
+
+
+def run_test_captured(stdout_proxy, name, test_func):
+    """Run a test on a worker thread, returning (result, captured output)"""
+    buffer = stdout_proxy.capture()
+    result = run_test(name, test_func)
+    return result, buffer.getvalue()
+
+
 def main():
     """Run all tests"""
     print("=" * 60)
     print("Ticket-to-Test AI - System Test")
     print("=" * 60)
     
-    tests = [
+    # These gate everything else, so they run first and in order
+    serial_tests = [
         ("Imports", test_imports),
         ("Sample Tickets", test_sample_tickets),
+    ]
+    # Independent of each other (two make blocking Gemini calls), so they run
+    # concurrently; their output is buffered and printed in this order
+    concurrent_tests = [
         ("API Key", test_api_key),
         ("Orchestrator", test_orchestrator),
         ("Excel Export", test_excel_export),
     ]
     
     results = []
-    for name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((name, result))
-        except Exception as e:
-            print(f"✗ {name} crashed: {e}")
-            results.append((name, False))
+    for name, test_func in serial_tests:
+        results.append((name, run_test(name, test_func)))
+    
+    stdout_proxy = _ThreadLocalStdout(sys.stdout)
+    sys.stdout = stdout_proxy
+    try:
+        with ThreadPoolExecutor(max_workers=len(concurrent_tests)) as executor:
+            futures = [
+                executor.submit(run_test_captured, stdout_proxy, name, test_func)
+                for name, test_func in concurrent_tests
+            ]
+            outcomes = [future.result() for future in futures]
+    finally:
+        sys.stdout = stdout_proxy.stream
+    
+    for (name, _), (result, output) in zip(concurrent_tests, outcomes):
+        print(output, end='')
+        results.append((name, result))
     
     # Ask about full pipeline test
     print("\n" + "=" * 60)
@@ -1,5 +1,14 @@
 """Utilities package"""
 from utils.excel_exporter import ExcelExporter
-from utils.sample_tickets import get_sample_ticket, SAMPLE_TICKETS
+from utils.sample_tickets import get_sample_ticket
 
 __all__ = ['ExcelExporter', 'get_sample_ticket', 'SAMPLE_TICKETS']
+
+
+def __getattr__(name: str):
+    # SAMPLE_TICKETS is built lazily by utils.sample_tickets; importing it here
+    # eagerly would build it on every import of the package
+    if name == "SAMPLE_TICKETS":
+        from utils.sample_tickets import SAMPLE_TICKETS
+        return SAMPLE_TICKETS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,37 +4,93 @@ Reduces redundant API calls for identical requests
 """
 import hashlib
 import json
-import os
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import time
 
+# zstandard compresses LLM output better and faster than zlib; fall back to
+# zlib if it isn't installed. Entries of either kind can be read back.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Errors meaning a stored entry itself is unreadable (as opposed to the
+# database being busy or this process lacking zstandard)
+_CORRUPT_ENTRY_ERRORS = (zlib.error, UnicodeDecodeError, TypeError)
+if zstandard is not None:
+    _CORRUPT_ENTRY_ERRORS += (zstandard.ZstdError,)
+
+
+def _compress(data: bytes) -> bytes:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data)
+
+
+def _decompress(blob: bytes) -> bytes:
+    if blob[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError("zstd-compressed cache entry but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return zlib.decompress(blob)
+
 
 class APICache:
     """
-    File-based cache for API responses
+    SQLite-backed cache for API responses
     """
     
-    def __init__(self, cache_dir: str = ".api_cache", ttl: int = 3600):
+    PURGE_INTERVAL = 100
+    
+    def __init__(self, cache_dir: str = ".api_cache", ttl: int = 3600, memory_size: int = 256):
         """
         Args:
-            cache_dir: Directory to store cache files
+            cache_dir: Directory to store the cache database
             ttl: Time-to-live in seconds (default: 1 hour)
+            memory_size: Number of recent entries also kept in memory
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.ttl = ttl
+        # Hot entries served without touching the database: key -> (timestamp, response)
+        self._mem: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+        self._mem_max = memory_size
+        # Expired rows are otherwise only removed when read; purge them in one
+        # DELETE every PURGE_INTERVAL writes so the table doesn't grow unbounded
+        self._writes_since_purge = 0
+        # One indexed table instead of a JSON file per entry; the connection is
+        # shared across threads, so access is serialized with a lock
+        self._conn = sqlite3.connect(str(self.cache_dir / "cache.db"), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            # Serve reads from a memory map of the file instead of read() syscalls
+            self._conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key BLOB PRIMARY KEY, ts REAL NOT NULL, model TEXT, response BLOB NOT NULL)"
+            )
     
-    def _get_cache_key(self, prompt: str, model: str, config: Dict) -> str:
+    def _get_cache_key(self, prompt: str, model: str, config: Dict) -> bytes:
         """Generate a unique cache key from request parameters"""
-        # Combine all parameters that affect the response
-        key_data = {
-            "prompt": prompt,
-            "model": model,
-            "config": config
-        }
-        key_string = json.dumps(key_data, sort_keys=True)
-        return hashlib.sha256(key_string.encode()).hexdigest()
+        # Hash all parameters that affect the response. The (possibly large)
+        # prompt is fed to the hasher directly rather than embedded in a JSON
+        # string first; only the small config dict needs canonicalizing.
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(prompt.encode('utf-8'))
+        hasher.update(b'\x00')
+        hasher.update(model.encode('utf-8'))
+        hasher.update(b'\x00')
+        hasher.update(json.dumps(config, sort_keys=True).encode('utf-8'))
+        return hasher.digest()
     
     def get(self, prompt: str, model: str, config: Dict) -> Optional[str]:
         """
@@ -49,27 +105,54 @@ class APICache:
             Cached response text or None if not found/expired
         """
         cache_key = self._get_cache_key(prompt, model, config)
-        cache_file = self.cache_dir / f"{cache_key}.json"
         
-        if not cache_file.exists():
-            return None
+        with self._lock:
+            entry = self._mem.get(cache_key)
+            if entry is not None:
+                if time.time() - entry[0] <= self.ttl:
+                    self._mem.move_to_end(cache_key)
+                    return entry[1]
+                del self._mem[cache_key]
         
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            
-            # Check if expired
-            if time.time() - cache_data['timestamp'] > self.ttl:
-                cache_file.unlink()  # Delete expired cache
-                return None
-            
-            return cache_data['response']
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT ts, response FROM cache WHERE key = ?", (cache_key,)
+                ).fetchone()
+        except sqlite3.Error:
+            # Locked or otherwise unavailable; treat as a miss and keep the entry
+            return None
         
-        except Exception:
-            # If cache is corrupted, remove it
-            if cache_file.exists():
-                cache_file.unlink()
+        if row is None:
+            return None
+        
+        # Check if expired
+        if time.time() - row[0] > self.ttl:
+            self._delete(cache_key)
+            return None
+        
+        try:
+            response = _decompress(row[1]).decode('utf-8')
+        except _CORRUPT_ENTRY_ERRORS:
+            # If the entry is corrupted, remove it
+            self._delete(cache_key)
+            return None
+        except ValueError:
+            # zstd entry but zstandard isn't installed here; leave it for
+            # processes that can read it
             return None
+        
+        with self._lock:
+            self._remember(cache_key, row[0], response)
+        return response
+    
+    def _delete(self, cache_key: bytes):
+        """Remove an entry, ignoring database errors (it is retried on the next read)"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (cache_key,))
+        except sqlite3.Error:
+            pass
     
     def set(self, prompt: str, model: str, config: Dict, response: str):
         """
@@ -82,24 +165,54 @@ class APICache:
             response: Response text to cache
         """
         cache_key = self._get_cache_key(prompt, model, config)
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        
-        cache_data = {
-            'timestamp': time.time(),
-            'prompt': prompt[:200],  # Store truncated prompt for reference
-            'model': model,
-            'response': response
-        }
+        timestamp = time.time()
         
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2)
+            with self._lock, self._conn:
+                self._remember(cache_key, timestamp, response)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, ts, model, response) VALUES (?, ?, ?, ?)",
+                    (cache_key, timestamp, model, _compress(response.encode('utf-8')))
+                )
+                self._writes_since_purge += 1
+                if self._writes_since_purge >= self.PURGE_INTERVAL:
+                    self._purge_expired_locked()
         except Exception as e:
             # Silently fail if caching doesn't work
             pass
     
+    def purge_expired(self) -> int:
+        """
+        Delete every expired entry in a single statement
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock, self._conn:
+            return self._purge_expired_locked()
+    
+    def _purge_expired_locked(self) -> int:
+        """Delete expired rows (caller holds self._lock inside a transaction)"""
+        self._writes_since_purge = 0
+        cursor = self._conn.execute("DELETE FROM cache WHERE ts < ?", (time.time() - self.ttl,))
+        return cursor.rowcount
+    
+    def _remember(self, cache_key: bytes, timestamp: float, response: str):
+        """Add an entry to the in-memory LRU (caller holds self._lock)"""
+        self._mem[cache_key] = (timestamp, response)
+        self._mem.move_to_end(cache_key)
+        while len(self._mem) > self._mem_max:
+            self._mem.popitem(last=False)
+    
     def clear(self):
         """Clear all cached responses"""
+        try:
+            with self._lock, self._conn:
+                self._mem.clear()
+                self._conn.execute("DELETE FROM cache")
+        except Exception:
+            pass
+        # Remove entries left over from the old one-JSON-file-per-entry layout
         for cache_file in self.cache_dir.glob("*.json"):
             try:
                 cache_file.unlink()
@@ -108,26 +221,16 @@ class APICache:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        cache_files = list(self.cache_dir.glob("*.json"))
-        valid_count = 0
-        expired_count = 0
-        
-        for cache_file in cache_files:
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                
-                if time.time() - cache_data['timestamp'] <= self.ttl:
-                    valid_count += 1
-                else:
-                    expired_count += 1
-            except Exception:
-                expired_count += 1
+        with self._lock:
+            total_count, valid_count = self._conn.execute(
+                "SELECT COUNT(*), COUNT(CASE WHEN ts >= ? THEN 1 END) FROM cache",
+                (time.time() - self.ttl,)
+            ).fetchone()
         
         return {
-            'total_entries': len(cache_files),
+            'total_entries': total_count,
             'valid_entries': valid_count,
-            'expired_entries': expired_count
+            'expired_entries': total_count - valid_count
         }
 
 
@@ -151,3 +254,8 @@ def get_api_cache(ttl: int = 3600) -> APICache:
         _global_cache = APICache(ttl=ttl)
     
     return _global_cache
+
+
+def peek_api_cache() -> Optional[APICache]:
+    """Return the global API cache if it has been created, without creating it"""
+    return _global_cache
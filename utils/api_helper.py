@@ -1,10 +1,56 @@
 """
 API Helper with retry logic for handling rate limits
 """
+import hashlib
+import json
+import random
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 import google.generativeai as genai
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 import re
+from utils.api_cache import peek_api_cache
+from utils.rate_limiter import RateLimiter
+
+# Calls currently in flight, keyed by request hash. Completed responses are
+# cached by APICache in the agents; this only stops identical requests issued
+# concurrently from each spending a rate-limited API call.
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Retry hints in rate limit errors, e.g. "Please retry in 13.868766102s"
+# (group 1) or "retry_delay { seconds: 13 }" (group 2), found in one scan.
+# Group 1 is preferred when both appear, in either order
+_RETRY_RE = re.compile(
+    r"retry in (\d+\.?\d*)\s*s|retry_delay.*?seconds:\s*(\d+)",
+    re.IGNORECASE | re.ASCII
+)
+
+# Moving average of how often recent calls were rate limited (0..1). Retry
+# delays are stretched by it so that, under sustained 429s, concurrent
+# callers back off further instead of hammering the quota together.
+_congestion = 0.0
+_congestion_lock = threading.Lock()
+
+
+def _record_rate_limit(rate_limited: bool) -> float:
+    """Fold one call outcome into the congestion average and return it"""
+    global _congestion
+    with _congestion_lock:
+        _congestion = 0.9 * _congestion + 0.1 * rate_limited
+        return _congestion
+
+
+def _request_key(model: genai.GenerativeModel, prompt: str, generation_config: Dict[str, Any]) -> str:
+    """Hash everything that determines the response"""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(getattr(model, 'model_name', '').encode('utf-8'))
+    hasher.update(b'\x00')
+    hasher.update(json.dumps(generation_config, sort_keys=True).encode('utf-8'))
+    hasher.update(b'\x00')
+    hasher.update(prompt.encode('utf-8'))
+    return hasher.hexdigest()
 
 
 def call_gemini_with_retry(
@@ -16,6 +62,12 @@ def call_gemini_with_retry(
     """
     Call Gemini API with automatic retry on rate limit errors
     
+    If an identical request (same model, config and prompt) is already in
+    flight on another thread, waits for and shares its result instead. The
+    request's hash doubles as an idempotency key: it is shown in retry
+    messages, and before each retry the shared API cache is checked in case
+    the response has meanwhile been stored there (e.g. by another process).
+    
     Args:
         model: Gemini model instance
         prompt: The prompt to send
@@ -28,14 +80,100 @@ def call_gemini_with_retry(
     Raises:
         Exception: If all retries are exhausted
     """
+    key = _request_key(model, prompt, generation_config)
+    
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = _inflight[key] = Future()
+    
+    if not is_owner:
+        return future.result()
+    
+    try:
+        response_text = _call_gemini(model, prompt, generation_config, max_retries, key)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(response_text)
+        return response_text
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+def call_gemini_batch(
+    model: genai.GenerativeModel,
+    prompts: List[str],
+    generation_config: Dict[str, Any],
+    rate_limiter: Optional[RateLimiter] = None,
+    max_workers: int = 3,
+    max_retries: int = 3,
+    on_result: Optional[Callable[[int, str], None]] = None
+) -> List[str]:
+    """
+    Call Gemini for several independent prompts concurrently
+    
+    Every call is still admitted through rate_limiter, so the request rate is
+    unchanged; what overlaps is each call's API latency with the next one's
+    rate-limit wait.
+    
+    Args:
+        model: Gemini model instance, shared by all calls
+        prompts: Prompts to send
+        generation_config: Generation configuration used for every prompt
+        rate_limiter: Limiter to wait on before each call (None = no limit)
+        max_workers: Maximum number of calls in flight at once
+        max_retries: Maximum number of retry attempts per call
+        on_result: Called with (prompt index, response text) as soon as each
+            call succeeds, so completed work survives another call failing
+    
+    Returns:
+        Response texts, in the same order as prompts
+    
+    Raises:
+        Exception: The first failed call's error, in prompt order
+    """
+    def call(index: int, prompt: str) -> str:
+        if rate_limiter:
+            rate_limiter.wait_if_needed()
+        response_text = call_gemini_with_retry(model, prompt, generation_config, max_retries)
+        if on_result:
+            on_result(index, response_text)
+        return response_text
+    
+    if len(prompts) <= 1:
+        return [call(i, prompt) for i, prompt in enumerate(prompts)]
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as executor:
+        return list(executor.map(call, range(len(prompts)), prompts))
+
+
+def _call_gemini(
+    model: genai.GenerativeModel,
+    prompt: str,
+    generation_config: Dict[str, Any],
+    max_retries: int,
+    request_key: str
+) -> str:
+    """Issue the request, retrying rate limit errors (see call_gemini_with_retry)"""
     last_error = None
     
     for attempt in range(max_retries):
+        if attempt > 0:
+            cached_response = _cached_response(model, prompt, generation_config)
+            if cached_response is not None:
+                print(f"♻️ Request {request_key[:12]} already answered; using the cached response instead of retrying")
+                return cached_response
+        
         try:
             response = model.generate_content(
                 prompt,
                 generation_config=genai.types.GenerationConfig(**generation_config)
             )
+            _record_rate_limit(False)
             return response.text
         
         except Exception as e:
@@ -44,15 +182,23 @@ def call_gemini_with_retry(
             
             # Check if it's a 429 rate limit error
             if "429" in error_str or "quota" in error_str.lower() or "rate" in error_str.lower():
+                congestion = _record_rate_limit(True)
+                
                 # Extract retry delay from error message if available
                 retry_delay = extract_retry_delay(error_str)
                 
                 if retry_delay is None:
-                    # Default exponential backoff: 15s, 30s, 60s
-                    retry_delay = min(15 * (2 ** attempt), 60)
+                    # Default exponential backoff (15s, 30s, 60s), jittered so
+                    # callers that failed together don't all retry together
+                    retry_delay = min(15 * (2 ** attempt), 60) * random.uniform(0.5, 1.5)
+                else:
+                    # The server's delay is a minimum, so only jitter upwards
+                    retry_delay *= random.uniform(1.0, 1.5)
+                
+                retry_delay *= 1 + congestion
                 
                 if attempt < max_retries - 1:
-                    print(f"⏱️ Rate limit hit. Waiting {retry_delay:.1f}s before retry {attempt + 1}/{max_retries}...")
+                    print(f"⏱️ Rate limit hit (request {request_key[:12]}). Waiting {retry_delay:.1f}s before retry {attempt + 1}/{max_retries}...")
                     time.sleep(retry_delay)
                     continue
             else:
@@ -63,6 +209,24 @@ def call_gemini_with_retry(
     raise last_error
 
 
+def _cached_response(
+    model: genai.GenerativeModel,
+    prompt: str,
+    generation_config: Dict[str, Any]
+) -> Optional[str]:
+    """Look the request up in the shared API cache, if one has been created"""
+    api_cache = peek_api_cache()
+    if api_cache is None:
+        return None
+    
+    # Agents cache under the model name they were configured with; the SDK
+    # adds a "models/" prefix to bare names
+    model_name = getattr(model, 'model_name', '')
+    if model_name.startswith('models/'):
+        model_name = model_name[len('models/'):]
+    return api_cache.get(prompt, model_name, generation_config)
+
+
 def extract_retry_delay(error_message: str) -> Optional[float]:
     """
     Extract retry delay from error message
@@ -73,18 +237,13 @@ def extract_retry_delay(error_message: str) -> Optional[float]:
     Returns:
         Retry delay in seconds, or None if not found
     """
-    # Look for patterns like "retry in 13.86s" or "Please retry in 13.868766102s"
-    patterns = [
-        r"retry in (\d+\.?\d*)\s*s",
-        r"retry_delay.*?seconds:\s*(\d+)",
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, error_message, re.IGNORECASE)
-        if match:
-            try:
-                return float(match.group(1)) + 1.0  # Add 1 second buffer
-            except ValueError:
-                continue
-    
-    return None
+    # Prefer the precise "retry in" value wherever it appears; the whole-second
+    # retry_delay field is only a fallback
+    fallback = None
+    for match in _RETRY_RE.finditer(error_message):
+        if match.group(1):
+            return float(match.group(1)) + 1.0  # Add 1 second buffer
+        if fallback is None:
+            fallback = float(match.group(2)) + 1.0
+    
+    return fallback
@@ -2,19 +2,227 @@
 Excel Test Case Exporter
 Generates professional Excel test case documents
 """
+from collections import Counter
+from dataclasses import dataclass, field
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
-from typing import List, Dict
+from typing import List, Dict, BinaryIO, Optional, Sequence, Tuple, Union
 from datetime import datetime
 from agents.state import AgentState, TestCase
 
+# Column letters by 0-based index ("A", "B", ...), enough for every sheet here
+_COL_LETTERS = tuple(get_column_letter(i) for i in range(1, 64))
+
+# (font, fill, alignment) for one named cell style; any part may be None
+CellStyle = Tuple[Optional[Font], Optional[PatternFill], Optional[Alignment]]
+
+
+def _xlsxwriter_format(font: Optional[Font], fill: Optional[PatternFill], alignment: Optional[Alignment]) -> Dict:
+    """Translate openpyxl style objects into an xlsxwriter format dict"""
+    fmt = {}
+    if font is not None:
+        if font.b:
+            fmt['bold'] = True
+        if font.sz:
+            fmt['font_size'] = font.sz
+        if font.color is not None and font.color.rgb:
+            fmt['font_color'] = '#' + font.color.rgb[-6:]
+    if fill is not None:
+        fmt['pattern'] = 1
+        fmt['bg_color'] = '#' + fill.fgColor.rgb[-6:]
+    if alignment is not None:
+        if alignment.wrap_text:
+            fmt['text_wrap'] = True
+        if alignment.horizontal:
+            fmt['align'] = alignment.horizontal
+        if alignment.vertical:
+            fmt['valign'] = 'vcenter' if alignment.vertical == 'center' else alignment.vertical
+    return fmt
+
+
+@dataclass(slots=True)
+class _TestCaseScan:
+    """Everything the sheets need from the test cases, gathered in one pass"""
+    priority_counts: Counter = field(default_factory=Counter)
+    category_counts: Counter = field(default_factory=Counter)
+    # (values, style names) for each Test Cases sheet row, in order
+    rows: List[Tuple[list, Tuple[str, ...]]] = field(default_factory=list)
+
+
+class _OpenpyxlSheet:
+    """Appends rows to an openpyxl write-only worksheet"""
+    
+    def __init__(self, ws, templates: Dict[str, Tuple[Tuple[str, object], ...]]):
+        self.ws = ws
+        self._templates = templates
+        self._rows = 0
+    
+    def set_column_widths(self, widths: Sequence[float]):
+        column_dimensions = self.ws.column_dimensions
+        for col, width in enumerate(widths):
+            column_dimensions[_COL_LETTERS[col]].width = width
+    
+    def freeze_panes(self, cell: str):
+        self.ws.freeze_panes = cell
+    
+    def append(self, values: Sequence, styles: Sequence[Optional[str]] = (), merge_through: int = 0):
+        """
+        Append one row
+        
+        Args:
+            values: Cell values from column A onwards (None leaves a cell empty)
+            styles: Style name for each leading cell, or None for no style
+            merge_through: If set, merge columns 1..merge_through of this row
+        """
+        ws = self.ws
+        templates = self._templates
+        row = list(values)
+        for i, name in enumerate(styles):
+            if name is None:
+                continue
+            cell = WriteOnlyCell(ws, value=row[i])
+            for attr, style in templates[name]:
+                setattr(cell, attr, style)
+            row[i] = cell
+        ws.append(row)
+        self._rows += 1
+        
+        if merge_through:
+            ws.merged_cells.add(f"A{self._rows}:{_COL_LETTERS[merge_through - 1]}{self._rows}")
+
+
+class _OpenpyxlBook:
+    """openpyxl backend: a write-only workbook, streamed to disk row by row"""
+    
+    def __init__(self, output_path: Union[str, BinaryIO], styles: Dict[str, CellStyle]):
+        self.output_path = output_path
+        # Each named style as the (attribute, style object) pairs to set on a
+        # cell. Every cell of a style gets the very same objects, so the
+        # workbook's style table holds one entry per named style, however
+        # many rows are written.
+        self._templates = {
+            name: tuple(
+                (attr, style_obj)
+                for attr, style_obj in zip(("font", "fill", "alignment"), style)
+                if style_obj is not None
+            )
+            for name, style in styles.items()
+        }
+        # Write-only workbooks start without a default sheet
+        self.wb = Workbook(write_only=True)
+    
+    def add_sheet(self, title: str) -> _OpenpyxlSheet:
+        return _OpenpyxlSheet(self.wb.create_sheet(title), self._templates)
+    
+    def save(self):
+        self.wb.save(self.output_path)
+
+
+class _XlsxWriterSheet:
+    """Writes rows to an xlsxwriter worksheet, in order (see _OpenpyxlSheet)"""
+    
+    def __init__(self, ws, formats: Dict[str, object]):
+        self.ws = ws
+        self._formats = formats
+        self._rows = 0
+    
+    def set_column_widths(self, widths: Sequence[float]):
+        for col, width in enumerate(widths):
+            self.ws.set_column(col, col, width)
+    
+    def freeze_panes(self, cell: str):
+        self.ws.freeze_panes(cell)
+    
+    def append(self, values: Sequence, styles: Sequence[Optional[str]] = (), merge_through: int = 0):
+        ws = self.ws
+        formats = self._formats
+        row = self._rows
+        self._rows += 1
+        
+        if merge_through:
+            fmt = formats[styles[0]] if styles and styles[0] is not None else None
+            ws.merge_range(row, 0, row, merge_through - 1, values[0], fmt)
+            return
+        
+        n_styles = len(styles)
+        for col, value in enumerate(values):
+            name = styles[col] if col < n_styles else None
+            if value is None and name is None:
+                continue
+            ws.write(row, col, value, formats[name] if name is not None else None)
+
+
+class _XlsxWriterBook:
+    """xlsxwriter backend: constant-memory mode flushes each row as it's finished"""
+    
+    def __init__(self, output_path: Union[str, BinaryIO], styles: Dict[str, CellStyle]):
+        import xlsxwriter
+        
+        self.wb = xlsxwriter.Workbook(output_path, {'constant_memory': True, 'strings_to_urls': False})
+        # Formats are created once per workbook, never per cell
+        self._formats = {
+            name: self.wb.add_format(_xlsxwriter_format(*style))
+            for name, style in styles.items()
+        }
+    
+    def add_sheet(self, title: str) -> _XlsxWriterSheet:
+        return _XlsxWriterSheet(self.wb.add_worksheet(title), self._formats)
+    
+    def save(self):
+        self.wb.close()
+
 
 class ExcelExporter:
     """
     Exports test cases to a professional Excel format
+    
+    Sheet builders describe each sheet as rows of values plus named styles and
+    hand them to a backend sheet, which streams them out one row at a time.
+    Column widths, freeze panes and merges are therefore configured before (or
+    alongside) the rows rather than after them.
     """
     
+    ENGINES = ("openpyxl", "xlsxwriter")
+    
+    # Shared style objects: built once and reused by every cell that needs them
+    TITLE_FONT = Font(size=16, bold=True, color="FFFFFF")
+    SHEET_TITLE_FONT = Font(size=14, bold=True, color="FFFFFF")
+    SECTION_FONT = Font(size=14, bold=True)
+    SUBSECTION_FONT = Font(size=12, bold=True)
+    BOLD_FONT = Font(bold=True)
+    HEADER_FONT = Font(bold=True, color="FFFFFF")
+    HEADER_FILL = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    CATEGORY_FILL = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type="solid")
+    GAPS_HEADER_FILL = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+    GAP_FILL = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
+    NO_GAPS_FILL = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+    DEFAULT_PRIORITY_FILL = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
+    WRAP = Alignment(wrap_text=True)
+    WRAP_TOP = Alignment(wrap_text=True, vertical="top")
+    
+    # Column widths (from column A) for the other sheets
+    _SUMMARY_COL_WIDTHS = (25, 50, 15, 15)
+    _ROADMAP_COL_WIDTHS = (3, 80, 20)
+    _COVERAGE_COL_WIDTHS = (3, 100)
+    
+    # Test Cases sheet layout: test case key, header and width for each column
+    _TC_COLUMNS = (
+        "test_id", "priority", "category", "title",
+        "preconditions", "test_steps", "expected_result",
+        "test_data", "automation_feasibility"
+    )
+    _TC_HEADERS = (
+        "Test ID", "Priority", "Category", "Title",
+        "Preconditions", "Test Steps", "Expected Result",
+        "Test Data", "Automation Feasibility"
+    )
+    _TC_COL_WIDTHS = (15, 10, 15, 40, 30, 50, 30, 20, 20)
+    _TC_PRIORITY_INDEX = _TC_COLUMNS.index("priority")
+    _TC_STEPS_INDEX = _TC_COLUMNS.index("test_steps")
+    
     def __init__(self):
         self.priority_colors = {
             "P0": "FF0000",  # Red
@@ -22,48 +230,127 @@ class ExcelExporter:
             "P2": "FFFF00",  # Yellow
             "P3": "90EE90"   # Light Green
         }
+        self.PRIORITY_FILLS = {
+            priority: PatternFill(start_color=color, end_color=color, fill_type="solid")
+            for priority, color in self.priority_colors.items()
+        }
+        
+        # Named cell styles the sheet builders refer to; each backend turns
+        # these into its own style objects once per workbook
+        self._styles: Dict[str, CellStyle] = {
+            "title": (self.TITLE_FONT, self.HEADER_FILL, None),
+            "sheet_title": (self.SHEET_TITLE_FONT, self.HEADER_FILL, None),
+            "section": (self.SECTION_FONT, None, None),
+            "subsection": (self.SUBSECTION_FONT, None, None),
+            "category": (self.SUBSECTION_FONT, self.CATEGORY_FILL, None),
+            "gaps_header": (self.SUBSECTION_FONT, self.GAPS_HEADER_FILL, None),
+            "bold": (self.BOLD_FONT, None, None),
+            "header": (self.HEADER_FONT, self.HEADER_FILL, self.HEADER_ALIGNMENT),
+            "wrap": (None, None, self.WRAP),
+            "wrap_top": (None, None, self.WRAP_TOP),
+            "gap": (None, self.GAP_FILL, self.WRAP),
+            "no_gaps": (None, self.NO_GAPS_FILL, None),
+            "priority": (None, self.DEFAULT_PRIORITY_FILL, None),
+            "priority_cell": (None, self.DEFAULT_PRIORITY_FILL, self.WRAP_TOP),
+        }
+        for priority, fill in self.PRIORITY_FILLS.items():
+            self._styles[f"priority_{priority}"] = (None, fill, None)
+            self._styles[f"priority_cell_{priority}"] = (None, fill, self.WRAP_TOP)
+        
+        # Style names for a whole Test Cases row, per priority: wrap text
+        # everywhere, plus the priority colour
+        def row_styles(priority_style: str) -> Tuple[str, ...]:
+            styles = ["wrap_top"] * len(self._TC_COLUMNS)
+            styles[self._TC_PRIORITY_INDEX] = priority_style
+            return tuple(styles)
+        
+        self._tc_row_styles = {
+            priority: row_styles(f"priority_cell_{priority}") for priority in self.PRIORITY_FILLS
+        }
+        self._tc_default_row_styles = row_styles("priority_cell")
     
-    def export_test_cases(self, state: AgentState, output_path: str) -> str:
+    def export_test_cases(
+        self,
+        state: AgentState,
+        output_path: Union[str, BinaryIO],
+        engine: str = "openpyxl"
+    ) -> Union[str, BinaryIO]:
         """
         Export test cases to Excel
         
         Args:
             state: Final agent state with test cases
-            output_path: Path to save Excel file
+            output_path: Path to save Excel file, or a writable binary stream
+            engine: "openpyxl" (default) or "xlsxwriter", which needs the
+                optional xlsxwriter package and is faster for large exports
         
         Returns:
-            Path to generated Excel file
+            The path or stream the workbook was written to
         """
-        wb = Workbook()
+        if engine == "openpyxl":
+            book = _OpenpyxlBook(output_path, self._styles)
+        elif engine == "xlsxwriter":
+            book = _XlsxWriterBook(output_path, self._styles)
+        else:
+            raise ValueError(f"Unknown Excel engine: {engine} (expected one of {', '.join(self.ENGINES)})")
         
-        # Create sheets
-        self._create_summary_sheet(wb, state)
-        self._create_test_cases_sheet(wb, state)
-        self._create_qa_roadmap_sheet(wb, state)
-        self._create_coverage_sheet(wb, state)
+        # One pass over the test cases feeds both the summary and the
+        # Test Cases sheet
+        scan = self._scan_test_cases(state["test_cases"])
         
-        # Remove default sheet
-        if "Sheet" in wb.sheetnames:
-            wb.remove(wb["Sheet"])
+        # Create sheets
+        self._create_summary_sheet(book, state, scan)
+        self._create_test_cases_sheet(book, scan)
+        self._create_qa_roadmap_sheet(book, state)
+        self._create_coverage_sheet(book, state)
         
         # Save
-        wb.save(output_path)
+        book.save()
         return output_path
     
-    def _create_summary_sheet(self, wb: Workbook, state: AgentState):
+    def _scan_test_cases(self, test_cases: List[TestCase]) -> _TestCaseScan:
+        """Count test cases by priority and category and prepare their rows"""
+        scan = _TestCaseScan()
+        priority_counts = scan.priority_counts
+        category_counts = scan.category_counts
+        add_row = scan.rows.append
+        
+        # Everything constant across rows is looked up once, outside the loop
+        columns = self._TC_COLUMNS
+        priority_index = self._TC_PRIORITY_INDEX
+        steps_index = self._TC_STEPS_INDEX
+        nl_join = "\n".join
+        styles_get = self._tc_row_styles.get
+        default_styles = self._tc_default_row_styles
+        
+        for tc in test_cases:
+            values = [tc.get(key, "") for key in columns]
+            priority = values[priority_index] = tc.get("priority", "P2")
+            priority_counts[priority] += 1
+            category_counts[tc.get("category", "Other")] += 1
+            
+            # Test steps as numbered list
+            values[steps_index] = nl_join([
+                f"{i}. {step}" for i, step in enumerate(tc.get("test_steps", []), 1)
+            ])
+            
+            add_row((values, styles_get(priority, default_styles)))
+        
+        return scan
+    
+    def _create_summary_sheet(self, book, state: AgentState, scan: _TestCaseScan):
         """Create summary overview sheet"""
-        ws = wb.active
-        ws.title = "Summary"
+        sheet = book.add_sheet("Summary")
+        
+        # Format column widths
+        sheet.set_column_widths(self._SUMMARY_COL_WIDTHS)
         
         # Header
-        ws["A1"] = "Ticket-to-Test AI - QA Execution Summary"
-        ws["A1"].font = Font(size=16, bold=True, color="FFFFFF")
-        ws["A1"].fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        ws.merge_cells("A1:D1")
+        sheet.append(["Ticket-to-Test AI - QA Execution Summary"], ("title",), merge_through=4)
+        sheet.append([])
         
         # Ticket Info
         ticket = state["ticket_info"]
-        row = 3
         info_fields = [
             ("Ticket ID:", ticket.get("ticket_id", "N/A")),
             ("Title:", ticket.get("title", "N/A")),
@@ -76,214 +363,101 @@ class ExcelExporter:
         ]
         
         for label, value in info_fields:
-            ws[f"A{row}"] = label
-            ws[f"A{row}"].font = Font(bold=True)
-            ws[f"B{row}"] = value
-            row += 1
+            sheet.append([label, value], ("bold",))
         
         # Test Case Statistics
-        row += 1
-        ws[f"A{row}"] = "Test Case Statistics"
-        ws[f"A{row}"].font = Font(size=14, bold=True)
-        row += 1
-        
-        test_cases = state["test_cases"]
-        priority_counts = {}
-        category_counts = {}
+        sheet.append([])
+        sheet.append(["Test Case Statistics"], ("section",))
         
-        for tc in test_cases:
-            priority = tc.get("priority", "P2")
-            category = tc.get("category", "Other")
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
-            category_counts[category] = category_counts.get(category, 0) + 1
-        
-        ws[f"A{row}"] = "Total Test Cases:"
-        ws[f"A{row}"].font = Font(bold=True)
-        ws[f"B{row}"] = len(test_cases)
-        row += 1
+        priority_counts = scan.priority_counts
         
-        ws[f"A{row}"] = "By Priority:"
-        ws[f"A{row}"].font = Font(bold=True)
-        row += 1
+        sheet.append(["Total Test Cases:", len(scan.rows)], ("bold",))
+        sheet.append(["By Priority:"], ("bold",))
         
         for priority in ["P0", "P1", "P2", "P3"]:
             count = priority_counts.get(priority, 0)
-            ws[f"B{row}"] = f"{priority}:"
-            ws[f"C{row}"] = count
-            ws[f"C{row}"].fill = PatternFill(
-                start_color=self.priority_colors.get(priority, "FFFFFF"),
-                end_color=self.priority_colors.get(priority, "FFFFFF"),
-                fill_type="solid"
-            )
-            row += 1
-        
-        # Format column widths
-        ws.column_dimensions["A"].width = 25
-        ws.column_dimensions["B"].width = 50
-        ws.column_dimensions["C"].width = 15
-        ws.column_dimensions["D"].width = 15
+            fill_style = f"priority_{priority}" if priority in self.PRIORITY_FILLS else "priority"
+            sheet.append([None, f"{priority}:", count], (None, None, fill_style))
     
-    def _create_test_cases_sheet(self, wb: Workbook, state: AgentState):
+    def _create_test_cases_sheet(self, book, scan: _TestCaseScan):
         """Create detailed test cases sheet"""
-        ws = wb.create_sheet("Test Cases")
-        
-        # Headers
-        headers = [
-            "Test ID", "Priority", "Category", "Title", 
-            "Preconditions", "Test Steps", "Expected Result",
-            "Test Data", "Automation Feasibility"
-        ]
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(1, col, header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        
-        # Data
-        test_cases = state["test_cases"]
-        for row_idx, tc in enumerate(test_cases, 2):
-            ws.cell(row_idx, 1, tc.get("test_id", ""))
-            
-            # Priority with color
-            priority_cell = ws.cell(row_idx, 2, tc.get("priority", "P2"))
-            priority = tc.get("priority", "P2")
-            priority_cell.fill = PatternFill(
-                start_color=self.priority_colors.get(priority, "FFFFFF"),
-                end_color=self.priority_colors.get(priority, "FFFFFF"),
-                fill_type="solid"
-            )
-            priority_cell.alignment = Alignment(horizontal="center")
-            
-            ws.cell(row_idx, 3, tc.get("category", ""))
-            ws.cell(row_idx, 4, tc.get("title", ""))
-            ws.cell(row_idx, 5, tc.get("preconditions", ""))
-            
-            # Test steps as numbered list
-            steps = tc.get("test_steps", [])
-            steps_text = "\n".join(f"{i+1}. {step}" for i, step in enumerate(steps))
-            ws.cell(row_idx, 6, steps_text)
-            
-            ws.cell(row_idx, 7, tc.get("expected_result", ""))
-            ws.cell(row_idx, 8, tc.get("test_data", ""))
-            ws.cell(row_idx, 9, tc.get("automation_feasibility", ""))
-            
-            # Wrap text for all cells in this row
-            for col in range(1, 10):
-                ws.cell(row_idx, col).alignment = Alignment(wrap_text=True, vertical="top")
+        sheet = book.add_sheet("Test Cases")
         
         # Format column widths
-        ws.column_dimensions["A"].width = 15
-        ws.column_dimensions["B"].width = 10
-        ws.column_dimensions["C"].width = 15
-        ws.column_dimensions["D"].width = 40
-        ws.column_dimensions["E"].width = 30
-        ws.column_dimensions["F"].width = 50
-        ws.column_dimensions["G"].width = 30
-        ws.column_dimensions["H"].width = 20
-        ws.column_dimensions["I"].width = 20
+        sheet.set_column_widths(self._TC_COL_WIDTHS)
         
         # Freeze header row
-        ws.freeze_panes = "A2"
+        sheet.freeze_panes("A2")
+        
+        # Headers
+        sheet.append(self._TC_HEADERS, ("header",) * len(self._TC_HEADERS))
+        
+        # Data: one prepared row per test case
+        append = sheet.append
+        for values, styles in scan.rows:
+            append(values, styles)
     
-    def _create_qa_roadmap_sheet(self, wb: Workbook, state: AgentState):
+    def _create_qa_roadmap_sheet(self, book, state: AgentState):
         """Create QA roadmap sheet"""
-        ws = wb.create_sheet("QA Roadmap")
+        sheet = book.add_sheet("QA Roadmap")
+        
+        # Column widths
+        sheet.set_column_widths(self._ROADMAP_COL_WIDTHS)
         
         # Header
-        ws["A1"] = "QA Execution Roadmap"
-        ws["A1"].font = Font(size=14, bold=True, color="FFFFFF")
-        ws["A1"].fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        ws.merge_cells("A1:C1")
+        sheet.append(["QA Execution Roadmap"], ("sheet_title",), merge_through=3)
+        sheet.append([])
         
         # Roadmap
-        row = 3
         qa_roadmap = state.get("qa_roadmap", {})
         
         for category, scenarios in qa_roadmap.items():
             # Category header
-            ws[f"A{row}"] = category
-            ws[f"A{row}"].font = Font(size=12, bold=True)
-            ws[f"A{row}"].fill = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type="solid")
-            ws.merge_cells(f"A{row}:C{row}")
-            row += 1
+            sheet.append([category], ("category",), merge_through=3)
             
             # Scenarios
             for scenario in scenarios:
-                ws[f"A{row}"] = "•"
-                ws[f"B{row}"] = scenario
-                ws[f"B{row}"].alignment = Alignment(wrap_text=True)
-                row += 1
+                sheet.append([None, f"• {scenario}"], (None, "wrap"))
             
-            row += 1  # Empty row between categories
-        
-        # Column widths
-        ws.column_dimensions["A"].width = 3
-        ws.column_dimensions["B"].width = 80
-        ws.column_dimensions["C"].width = 20
+            sheet.append([])  # Empty row between categories
     
-    def _create_coverage_sheet(self, wb: Workbook, state: AgentState):
+    def _create_coverage_sheet(self, book, state: AgentState):
         """Create coverage analysis sheet"""
-        ws = wb.create_sheet("Coverage Analysis")
+        sheet = book.add_sheet("Coverage Analysis")
         
-        # Header
-        ws["A1"] = "Coverage Analysis & Gaps"
-        ws["A1"].font = Font(size=14, bold=True, color="FFFFFF")
-        ws["A1"].fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        ws.merge_cells("A1:B1")
+        # Column widths
+        sheet.set_column_widths(self._COVERAGE_COL_WIDTHS)
         
-        row = 3
+        # Header
+        sheet.append(["Coverage Analysis & Gaps"], ("sheet_title",), merge_through=2)
+        sheet.append([])
         
         # Requirements Coverage
-        ws[f"A{row}"] = "Requirements to Cover"
-        ws[f"A{row}"].font = Font(size=12, bold=True)
-        row += 1
+        sheet.append(["Requirements to Cover"], ("subsection",))
         
         for req in state.get("extracted_requirements", []):
-            ws[f"A{row}"] = "•"
-            ws[f"B{row}"] = req
-            ws[f"B{row}"].alignment = Alignment(wrap_text=True)
-            row += 1
+            sheet.append([None, f"• {req}"], (None, "wrap"))
         
-        row += 1
+        sheet.append([])
         
         # Coverage Gaps
-        ws[f"A{row}"] = "Identified Coverage Gaps"
-        ws[f"A{row}"].font = Font(size=12, bold=True)
-        ws[f"A{row}"].fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-        row += 1
+        sheet.append(["Identified Coverage Gaps"], ("gaps_header",))
         
         gaps = state.get("coverage_gaps", [])
         if gaps:
             for gap in gaps:
-                ws[f"A{row}"] = "⚠"
-                ws[f"B{row}"] = gap
-                ws[f"B{row}"].alignment = Alignment(wrap_text=True)
-                ws[f"B{row}"].fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-                row += 1
+                sheet.append([None, f"⚠ {gap}"], (None, "gap"))
         else:
-            ws[f"B{row}"] = "No coverage gaps identified - Excellent coverage!"
-            ws[f"B{row}"].fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-            row += 1
+            sheet.append([None, "No coverage gaps identified - Excellent coverage!"], (None, "no_gaps"))
         
-        row += 1
+        sheet.append([])
         
         # Clarification Questions
-        ws[f"A{row}"] = "Clarification Questions"
-        ws[f"A{row}"].font = Font(size=12, bold=True)
-        row += 1
+        sheet.append(["Clarification Questions"], ("subsection",))
         
         questions = state.get("clarification_questions", [])
         if questions:
             for question in questions:
-                ws[f"A{row}"] = "?"
-                ws[f"B{row}"] = question
-                ws[f"B{row}"].alignment = Alignment(wrap_text=True)
-                row += 1
+                sheet.append([None, f"? {question}"], (None, "wrap"))
         else:
-            ws[f"B{row}"] = "No clarification needed"
-            row += 1
-        
-        # Column widths
-        ws.column_dimensions["A"].width = 3
-        ws.column_dimensions["B"].width = 100
+            sheet.append([None, "No clarification needed"])
@@ -3,8 +3,7 @@ Rate Limiter for Gemini API calls
 Handles free tier limits: 5 requests per minute (RPM)
 """
 import time
-from collections import deque
-from threading import Lock
+from threading import Event, Lock
 from typing import Optional
 import streamlit as st
 
@@ -22,8 +21,15 @@ class RateLimiter:
         """
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = deque()
+        # Ring buffer of the last max_requests request times (time.monotonic(),
+        # so wall-clock adjustments can't stall or skip waits). self.head is
+        # the slot holding the oldest one, which the next request overwrites;
+        # unused slots are -inf and so always count as expired.
+        self.requests = [float('-inf')] * max_requests
+        self.head = 0
         self.lock = Lock()
+        # Set by reset() to cut short a wait in progress
+        self._cancel = Event()
         # Minimum seconds between requests (for free tier: 60/5 = 12 seconds)
         self.min_interval = time_window / max_requests if max_requests > 0 else 0
     
@@ -37,72 +43,75 @@ class RateLimiter:
         Returns:
             Seconds waited (0 if no wait needed)
         """
+        # Decide when this request may go and reserve that slot up front, so
+        # the lock is only held for the bookkeeping, never across the wait.
+        # Later callers see the reserved (future) time and queue behind it.
         with self.lock:
-            now = time.time()
+            now = time.monotonic()
             wait_time = 0.0
             
-            # Remove requests outside the time window
-            while self.requests and now - self.requests[0] >= self.time_window:
-                self.requests.popleft()
-            
-            # Check if we need to wait due to max requests
-            if len(self.requests) >= self.max_requests:
+            # Check if we need to wait due to max requests: all slots are in
+            # use once even the oldest request is still inside the window
+            oldest_request = self.requests[self.head]
+            if now - oldest_request < self.time_window:
                 # Calculate wait time until oldest request expires
-                oldest_request = self.requests[0]
                 wait_time = self.time_window - (now - oldest_request) + 0.5  # Add buffer
             
             # Also enforce minimum interval between requests (for free tier)
-            if self.requests and len(self.requests) > 0:
-                last_request = self.requests[-1]
-                time_since_last = now - last_request
-                min_wait = self.min_interval - time_since_last
-                
-                # Use the maximum of the two wait times
-                wait_time = max(wait_time, min_wait)
+            last_request = self.requests[self.head - 1]
+            time_since_last = now - last_request
+            min_wait = self.min_interval - time_since_last
+            
+            # Use the maximum of the two wait times
+            wait_time = max(wait_time, min_wait)
+            
+            # Reserve the oldest slot for this request at its admit time
+            slot = self.head
+            requests = self.requests
+            reserved_at = now + max(wait_time, 0.0)
+            requests[slot] = reserved_at
+            self.head = (slot + 1) % self.max_requests
+        
+        # Wait if needed
+        if wait_time > 0:
+            # Notify about wait
+            if progress_callback:
+                progress_callback(wait_time)
             
-            # Wait if needed
-            if wait_time > 0:
-                # Notify about wait
-                if progress_callback:
-                    progress_callback(wait_time)
-                
-                # Wait with visual feedback
-                self._wait_with_feedback(wait_time)
-                
-                # Clean up after waiting
-                now = time.time()
-                while self.requests and now - self.requests[0] >= self.time_window:
-                    self.requests.popleft()
+            # Wait with visual feedback
+            self._wait_with_feedback(wait_time)
             
-            # Record this request
-            self.requests.append(time.time())
-            return wait_time
+            # Record the actual admit time, unless reset() has since discarded
+            # the reservation (it replaces the buffer)
+            with self.lock:
+                if self.requests is requests and requests[slot] == reserved_at:
+                    requests[slot] = time.monotonic()
+        
+        return wait_time
     
     def _wait_with_feedback(self, wait_time: float):
-        """Wait with incremental sleep to allow UI updates"""
-        end_time = time.time() + wait_time
-        
-        while time.time() < end_time:
-            remaining = end_time - time.time()
-            sleep_duration = min(0.1, remaining)  # Sleep in small chunks
-            if sleep_duration > 0:
-                time.sleep(sleep_duration)
+        """Block for wait_time seconds, or until reset() cancels the wait"""
+        # progress_callback has already been told the full wait up front, so
+        # there is nothing to update part-way through; one blocking wait
+        # replaces polling in 100 ms slices
+        self._cancel.wait(timeout=wait_time)
     
     def get_remaining_capacity(self) -> int:
         """Get number of requests available without waiting"""
         with self.lock:
-            now = time.time()
-            
-            # Remove expired requests
-            while self.requests and now - self.requests[0] >= self.time_window:
-                self.requests.popleft()
-            
-            return max(0, self.max_requests - len(self.requests))
+            now = time.monotonic()
+            in_window = sum(1 for t in self.requests if now - t < self.time_window)
+            return self.max_requests - in_window
     
     def reset(self):
-        """Reset the rate limiter"""
+        """Reset the rate limiter, waking any caller that is currently waiting"""
         with self.lock:
-            self.requests.clear()
+            self.requests = [float('-inf')] * self.max_requests
+            self.head = 0
+            # Wakes every current waiter; clearing straight away only affects
+            # waits that start after the reset
+            self._cancel.set()
+            self._cancel.clear()
 
 
 # Global rate limiter instance
@@ -4,8 +4,11 @@ Sample ticket data for demo purposes
 from agents.state import TicketInfo
 
 
-SAMPLE_TICKETS = {
-    "bug_fix": TicketInfo(
+# Tickets are built on demand rather than at import time; each call returns a
+# fresh TicketInfo, so callers are free to modify it.
+def _bug_fix() -> TicketInfo:
+    """Login bug ticket"""
+    return TicketInfo(
         ticket_id="BUG-1234",
         title="User login fails with special characters in password",
         description="""
@@ -51,9 +54,12 @@ Login fails with "Invalid credentials" error.
             }
         ],
         linked_tickets=["STORY-456", "BUG-1100"]
-    ),
-    
-    "feature": TicketInfo(
+    )
+
+
+def _feature() -> TicketInfo:
+    """PDF export feature ticket"""
+    return TicketInfo(
         ticket_id="FEAT-5678",
         title="Add export to PDF functionality for reports",
         description="""
@@ -100,9 +106,12 @@ Add an "Export to PDF" button on the reports page that generates a formatted PDF
             }
         ],
         linked_tickets=["EPIC-123"]
-    ),
-    
-    "api_change": TicketInfo(
+    )
+
+
+def _api_change() -> TicketInfo:
+    """Profile API change ticket"""
+    return TicketInfo(
         ticket_id="TASK-9012",
         title="Update user profile API to include profile picture upload",
         description="""
@@ -159,6 +168,12 @@ Request body (multipart/form-data):
         ],
         linked_tickets=["FEAT-5000", "BUG-8900"]
     )
+
+
+_BUILDERS = {
+    "bug_fix": _bug_fix,
+    "feature": _feature,
+    "api_change": _api_change,
 }
 
 
@@ -172,4 +187,13 @@ def get_sample_ticket(ticket_type: str = "bug_fix") -> TicketInfo:
     Returns:
         Sample TicketInfo
     """
-    return SAMPLE_TICKETS.get(ticket_type, SAMPLE_TICKETS["bug_fix"])
+    return _BUILDERS.get(ticket_type, _bug_fix)()
+
+
+def __getattr__(name: str):
+    """Build SAMPLE_TICKETS (all sample tickets by type) on first access"""
+    if name == "SAMPLE_TICKETS":
+        tickets = {ticket_type: build() for ticket_type, build in _BUILDERS.items()}
+        globals()["SAMPLE_TICKETS"] = tickets
+        return tickets
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")